@@ -4,24 +4,17 @@ Demo script showing ConfigurableDataLoader with summary reporting.
 """
 
 import sys
-from pathlib import Path
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from loguru import logger
-from src.loader.configurable_loader import ConfigurableDataLoader
+from arepas.loader import ConfigurableDataLoader
 
 
-def demo_data2_loading():
+def demo_data2_loading(loader: ConfigurableDataLoader):
     """Demo loading data2 with summary reporting."""
     logger.info("=" * 60)
     logger.info("Demo: Loading data2/ with ConfigurableDataLoader")
     logger.info("=" * 60)
     
-    # Load with config
-    loader = ConfigurableDataLoader("config/data2.json")
-    
     # Show config info
     info = loader.get_config_info()
     logger.info(f"\n📋 Configuration:")
@@ -43,17 +36,15 @@ def demo_data2_loading():
     return all_data, summary
 
 
-def demo_single_neighborhood():
+def demo_single_neighborhood(loader: ConfigurableDataLoader, all_data=None):
     """Demo loading a single neighborhood with merging."""
     logger.info("\n" + "=" * 60)
     logger.info("Demo: Loading Streetcar Commercial (3 sub-areas)")
     logger.info("=" * 60)
     
-    loader = ConfigurableDataLoader("config/data2.json")
-    
-    # Load and merge Streetcar Commercial
+    # Merge Streetcar Commercial, reusing datasets already loaded by demo 1
     logger.info("\n🔄 Loading Streetcar Commercial with merge=True...")
-    data = loader.load_neighborhood("StreetcarCommercial", merge=True)
+    data = loader.load_neighborhood("StreetcarCommercial", merge=True, loaded=all_data)
     
     logger.info(f"\n✅ Merged Result:")
     logger.info(f"  Name: {data.name}")
@@ -64,15 +55,15 @@ def demo_single_neighborhood():
     return data
 
 
-def demo_comparison():
+def demo_comparison(loader_data2: ConfigurableDataLoader, data2=None):
     """Compare data/ vs data2/ structures."""
     logger.info("\n" + "=" * 60)
     logger.info("Demo: Comparing data/ vs data2/ structures")
     logger.info("=" * 60)
     
-    # Load data2
-    loader_data2 = ConfigurableDataLoader("config/data2.json")
-    data2 = loader_data2.load_all_datasets()
+    # Load data2 (unless already loaded)
+    if data2 is None:
+        data2 = loader_data2.load_all_datasets()
     summary_data2 = loader_data2.get_summary(data2)
     
     logger.info(f"\n📊 data2/ structure (neighborhood-based):")
@@ -97,14 +88,17 @@ if __name__ == "__main__":
     
     # Run demos
     try:
+        # One loader shared by all demos
+        loader = ConfigurableDataLoader("config/data2.json")
+        
         # Demo 1: Load all data with summary
-        all_data, summary = demo_data2_loading()
+        all_data, summary = demo_data2_loading(loader)
         
         # Demo 2: Load single neighborhood
-        streetcar_data = demo_single_neighborhood()
+        streetcar_data = demo_single_neighborhood(loader, all_data)
         
         # Demo 3: Comparison (if data/ config exists)
-        # demo_comparison()
+        # demo_comparison(loader, all_data)
         
         logger.success("\n🎉 All demos completed successfully!")
         
@@ -7,10 +7,7 @@ import sys
 import time
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from src.loader.configurable_loader import ConfigurableDataLoader
+from arepas.loader import ConfigurableDataLoader
 
 
 def test_performance():
@@ -59,9 +56,10 @@ def test_performance():
         all_data = loader.load_all_datasets()
         elapsed = time.time() - start_time
         
-        total_buildings = sum(d.total_buildings for d in all_data.values())
-        total_with_images = sum(d.buildings_with_images for d in all_data.values())
-        total_images = sum(d.total_images for d in all_data.values())
+        summary = loader.get_summary(all_data)
+        total_buildings = summary['total_buildings']
+        total_with_images = summary['total_buildings_with_images']
+        total_images = summary['total_images']
         
         print(f"\n⏱️  Performance Results:")
         print(f"   Time elapsed: {elapsed:.2f} seconds")
@@ -4,36 +4,81 @@ GitHub readiness verification script for Arepas project.
 Checks that all necessary files are in place and functioning.
 """
 
+import os
+import re
 import sys
 from pathlib import Path
+from typing import List, Optional
+import importlib.machinery
 import importlib.util
 
 
+# Files and directories that should never be committed, classified in one match
+SENSITIVE_RE = re.compile(r'^(?:__pycache__|\.DS_Store|\.env)$|\.(?:log|pyc)$')
+SKIP_DIRS = {'.git', '.venv'}
+
+# Markdown files with less content than this are reported as very short
+MIN_MARKDOWN_CHARS = 100
+# Files at least this large are assumed to have real content without reading them
+MARKDOWN_READ_LIMIT = 4096
+
+
 def check_file_exists(filepath: str, description: str) -> bool:
     """Check if a file exists and report status."""
-    path = Path(filepath)
-    exists = path.exists()
+    try:
+        size = os.stat(filepath).st_size
+        exists = True
+    except OSError:
+        exists = False
     status = "✅" if exists else "❌"
     print(f"{status} {description}: {filepath}")
     if exists and filepath.endswith('.md'):
-        # Check if markdown files have content
-        content = path.read_text(encoding='utf-8')
-        if len(content.strip()) < 100:
+        # Check if markdown files have content; the size answers most cases
+        # and only mid-sized files are read to discount surrounding whitespace
+        if size < MIN_MARKDOWN_CHARS:
+            short = True
+        elif size < MARKDOWN_READ_LIMIT:
+            content = Path(filepath).read_text(encoding='utf-8')
+            short = len(content.strip()) < MIN_MARKDOWN_CHARS
+        else:
+            short = False
+        if short:
             print(f"   ⚠️  Warning: {filepath} appears to be very short")
     return exists
 
 
-def check_import(module_name: str, description: str) -> bool:
-    """Check if a module can be imported."""
+def find_module_spec(module_name: str) -> Optional[importlib.machinery.ModuleSpec]:
+    """
+    Locate an installed module without executing it.
+    
+    importlib.util.find_spec imports every parent package on the way (and
+    arepas.loader pulls in pandas), so only the top-level package is resolved
+    through the import system and the rest of the dotted name is walked with
+    PathFinder.
+    """
+    top, *rest = module_name.split('.')
+    spec = importlib.util.find_spec(top)
+    for part in rest:
+        if spec is None or spec.submodule_search_locations is None:
+            return None  # Missing, or parent is a plain module, not a package
+        spec = importlib.machinery.PathFinder.find_spec(part, spec.submodule_search_locations)
+    return spec
+
+
+def check_import(module_name: str, description: str, execute: bool = False) -> bool:
+    """
+    Check that a module can be found, optionally importing it.
+    
+    Args:
+        module_name: Dotted module name of the installed package
+        description: Label to print
+        execute: If True, actually import the module (runs its code)
+    """
     try:
-        # Add src to path for imports
-        import sys
-        from pathlib import Path
-        src_path = Path(__file__).parent.parent / 'src'
-        if str(src_path) not in sys.path:
-            sys.path.insert(0, str(src_path))
-        
-        __import__(module_name.replace('src.', ''))
+        if execute:
+            importlib.import_module(module_name)
+        elif find_module_spec(module_name) is None:
+            raise ModuleNotFoundError(f"No module named '{module_name}'")
         print(f"✅ {description}: {module_name}")
         return True
     except Exception as e:
@@ -41,6 +86,25 @@ def check_import(module_name: str, description: str) -> bool:
         return False
 
 
+def find_sensitive_files(root: str = '.') -> List[Path]:
+    """Walk the tree once and collect entries that should be gitignored."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root, topdown=True):
+        # Record flagged directories but don't descend into them (or skipped ones)
+        kept = []
+        for name in dirnames:
+            if SENSITIVE_RE.search(name):
+                found.append(Path(dirpath, name))
+            elif name not in SKIP_DIRS:
+                kept.append(name)
+        dirnames[:] = kept
+        
+        for name in filenames:
+            if SENSITIVE_RE.search(name):
+                found.append(Path(dirpath, name))
+    return found
+
+
 def main():
     """Run all verification checks."""
     print("🔍 Verifying Arepas GitHub Readiness")
@@ -51,6 +115,7 @@ def main():
         ("README.md", "Main documentation"),
         ("LICENSE", "License file"),
         ("requirements.txt", "Python dependencies"),
+        ("pyproject.toml", "Package metadata"),
         (".gitignore", "Git ignore rules"),
         ("CONTRIBUTING.md", "Contribution guidelines"),
         ("CHANGELOG.md", "Change log"),
@@ -96,15 +161,8 @@ def main():
     py_files = list(Path('src').rglob('*.py'))
     print(f"✅ Python source files: {len(py_files)}")
     
-    # Check for sensitive files that shouldn't be committed
-    sensitive_patterns = ['*.log', '*.pyc', '__pycache__', '.DS_Store', '.env']
-    sensitive_found = []
-    for pattern in sensitive_patterns:
-        matches = list(Path('.').rglob(pattern))
-        # Filter out .venv directory
-        matches = [m for m in matches if not str(m).startswith('.venv/')]
-        if matches:
-            sensitive_found.extend(matches)
+    # Check for sensitive files that shouldn't be committed (single tree walk)
+    sensitive_found = find_sensitive_files('.')
     
     if sensitive_found:
         # Categorize by type
@@ -124,14 +182,14 @@ def main():
     else:
         print("✅ No sensitive files found in repository")
     
-    # Import tests AFTER checking for cache files
+    # Module checks locate sources without executing them
     print("\n🔧 Module Imports")
     print("-" * 20)
     imports_to_test = [
-        ("src.loader", "Loader package"),
-        ("src.loader.configurable_loader", "ConfigurableDataLoader"),
-        ("src.loader.csv_parser", "CSV Parser"),
-        ("src.loader.image_index", "Image Index"),
+        ("arepas.loader", "Loader package"),
+        ("arepas.loader.configurable_loader", "ConfigurableDataLoader"),
+        ("arepas.loader.csv_parser", "CSV Parser"),
+        ("arepas.loader.image_index", "Image Index"),
     ]
     
     imports_ok = all(check_import(module, desc) for module, desc in imports_to_test)
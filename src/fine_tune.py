@@ -1,10 +1,18 @@
 # Placeholder for OpenAI Vision fine-tuning logic
 # Replace with actual OpenAI Vision fine-tuning code when available
 
+from typing import Iterable
+import pandas as pd
 from loguru import logger
 
-def fine_tune_model(images, attributes):
-    # TODO: Integrate with OpenAI Vision fine-tuning API
-    logger.info(f"Fine-tuning model with {len(images)} images and {len(attributes)} attribute records.")
-    # Example: openai.vision.fine_tune(...)
-    pass
+def fine_tune_model(chunks: Iterable[pd.DataFrame]):
+    # Consume building tables chunk by chunk (e.g. ConfigurableDataLoader.iter_dataset)
+    # so a whole neighborhood never has to be held in memory
+    total_buildings = 0
+    total_images = 0
+    for chunk in chunks:
+        total_buildings += len(chunk)
+        total_images += int(chunk['n_images'].sum())
+        # TODO: Integrate with OpenAI Vision fine-tuning API
+        # Example: openai.vision.fine_tune(...)
+    logger.info(f"Fine-tuning model with {total_images} images and {total_buildings} attribute records.")
@@ -6,10 +6,11 @@ including CSV parsing, image indexing, and JSON-driven configuration.
 """
 
 # Core loading classes
-from .configurable_loader import ConfigurableDataLoader, NeighborhoodData
+from .configurable_loader import BuildingEntry, ConfigurableDataLoader, NeighborhoodData
 
 # Specialized components
 from .csv_parser import RobustCSVParser, CSVParseError
+from .dataset_cache import DatasetCache
 from .image_index import ImageIndex
 
 # Convenience exports for common usage patterns
@@ -17,9 +18,11 @@ __all__ = [
     # Main classes
     'ConfigurableDataLoader',
     'NeighborhoodData',
+    'BuildingEntry',
     
     # Components
     'RobustCSVParser',
+    'DatasetCache',
     'ImageIndex',
     
     # Exceptions
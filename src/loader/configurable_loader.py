@@ -5,30 +5,154 @@ This module provides a flexible data loading system that uses JSON configuration
 to map datasets to their CSV and image locations, supporting any directory structure.
 """
 
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+from dataclasses import dataclass, field
+import numpy as np
 import pandas as pd
 from loguru import logger
 
 try:
     from .csv_parser import RobustCSVParser
+    from .dataset_cache import DatasetCache, PARQUET_COMPRESSION
     from .image_index import ImageIndex
     from .load_config import DataStructureConfig
 except ImportError:
     from csv_parser import RobustCSVParser
+    from dataset_cache import DatasetCache, PARQUET_COMPRESSION
     from image_index import ImageIndex
     from load_config import DataStructureConfig
 
 
+# Columns added to the attribute columns of every building table
+IMAGE_PATHS_COLUMN = 'image_paths'
+N_IMAGES_COLUMN = 'n_images'
+DATASET_COLUMN = 'dataset'
+BUILDING_COLUMNS = [IMAGE_PATHS_COLUMN, N_IMAGES_COLUMN, DATASET_COLUMN]
+
+# Manifest written next to the per-dataset tables by save_cache
+SUMMARY_FILE = 'summary.parquet'
+
+
+@dataclass
+class BuildingEntry:
+    """
+    One building in the NeighborhoodData.buildings view.
+    
+    Entries belong to the cached view and are shared between accesses; the
+    loader itself works on NeighborhoodData.df and never builds them.
+    """
+    __slots__ = ('attributes', 'images', 'dataset')  # No per-entry __dict__
+    
+    attributes: Dict[str, Any]
+    images: List[str]
+    dataset: str
+    
+    def __getitem__(self, key: str) -> Any:
+        """Dict-style access (entry['images']) for code written against the dict layout."""
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+
 @dataclass
 class NeighborhoodData:
-    """Container for neighborhood loading results."""
+    """
+    Container for neighborhood loading results.
+    
+    Buildings are stored column-wise in a single DataFrame indexed by building
+    ID, holding the CSV attribute columns plus 'image_paths' (list of image
+    paths), 'n_images' and 'dataset'.
+    """
     name: str
-    buildings: Dict[str, Dict[str, Any]]
-    total_buildings: int
-    buildings_with_images: int
-    total_images: int
+    df: pd.DataFrame
+    _buildings: Optional[Dict[str, BuildingEntry]] = field(default=None, init=False,
+                                                           repr=False, compare=False)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        # Reassigning the table invalidates the cached buildings view
+        if name == 'df':
+            object.__setattr__(self, '_buildings', None)
+        object.__setattr__(self, name, value)
+    
+    @property
+    def total_buildings(self) -> int:
+        """Number of buildings."""
+        return len(self.df)
+    
+    @property
+    def buildings_with_images(self) -> int:
+        """Number of buildings with at least one matched image."""
+        return int((self.df[N_IMAGES_COLUMN] > 0).sum())
+    
+    @property
+    def total_images(self) -> int:
+        """Total number of matched images."""
+        return int(self.df[N_IMAGES_COLUMN].sum())
+    
+    @property
+    def buildings(self) -> Dict[str, BuildingEntry]:
+        """
+        Per-building view of the table.
+        
+        Entries are BuildingEntry objects that also accept the old dict-style
+        keys; attributes are plain {column: value} dicts built in one pass over
+        the table. Prefer working with df directly; this is kept for code
+        written against the dict layout.
+        
+        The view is built on first access and cached until df is reassigned,
+        so repeated data.buildings[bid] lookups are cheap. In-place changes to
+        df are not tracked; reassign df (or call refresh_buildings) after them.
+        """
+        if self._buildings is None:
+            attributes = self.df.drop(columns=BUILDING_COLUMNS).to_dict('records')
+            self._buildings = {
+                building_id: BuildingEntry(row, images, dataset)
+                for building_id, row, images, dataset in zip(
+                    self.df.index, attributes, self.df[IMAGE_PATHS_COLUMN], self.df[DATASET_COLUMN]
+                )
+            }
+        return self._buildings
+    
+    def refresh_buildings(self) -> None:
+        """Drop the cached buildings view after modifying df in place."""
+        self._buildings = None
+
+
+def _is_key_column(column: str) -> bool:
+    """Whether a column is needed for image matching and so is never dropped."""
+    # ID-like columns and smithsonianNumber are always needed for image matching
+    return column == 'smithsonianNumber' or 'id' in column.lower()
+
+
+@lru_cache(maxsize=None)
+def _find_id_column(columns: Tuple[str, ...]) -> Optional[str]:
+    """
+    Find the appropriate ID column among a table's columns.
+    
+    Cached per column layout: datasets and chunks of the same CSV share it.
+    """
+    # Try exact match first
+    if 'id' in columns:
+        return 'id'
+    
+    # Look for columns containing 'id' (case-insensitive)
+    id_columns = [col for col in columns if 'id' in col.lower()]
+    if id_columns:
+        logger.debug("Found ID columns: {}, using {}", id_columns, id_columns[0])
+        return id_columns[0]
+    
+    return None
+
+
+def _restore_image_lists(buildings: pd.DataFrame) -> pd.DataFrame:
+    """Convert image paths read back from Parquet (arrays) into plain lists."""
+    paths = pd.Series([list(p) for p in buildings[IMAGE_PATHS_COLUMN]],
+                      index=buildings.index, dtype=object)
+    return buildings.assign(**{IMAGE_PATHS_COLUMN: paths})
 
 
 class ConfigurableDataLoader:
@@ -39,12 +163,16 @@ class ConfigurableDataLoader:
     from a configuration file. No structure detection needed.
     """
     
-    def __init__(self, config_path: str = "config/data.json"):
+    def __init__(self, config_path: str = "config/data.json", cache: bool = True,
+                 cache_dir: Optional[str] = None, max_workers: int = 8):
         """
         Initialize loader with configuration file.
         
         Args:
             config_path: Path to JSON configuration file
+            cache: If True, reuse building tables cached on disk
+            cache_dir: Cache directory (defaults to ~/.cache/arepas)
+            max_workers: Maximum number of datasets loaded concurrently
         """
         self.config_path = Path(config_path)
         
@@ -56,69 +184,160 @@ class ConfigurableDataLoader:
         self.base_path = Path(self.config.base_path)
         
         self.csv_parser = RobustCSVParser()
+        self.MAX_WORKERS = max_workers
+        
+        # Optional column declarations ({column: dtype}) narrow every CSV read
+        columns = self.config.columns
+        self._usecols = self._keep_column if columns else None
+        self._dtypes = {col: dtype for col, dtype in columns.items() if dtype} if columns else None
+        self.use_cache = cache
+        self.cache = DatasetCache(cache_dir)
+        
+        # Image indexes by resolved directory, shared by datasets with the same images
+        self._image_indexes: Dict[str, ImageIndex] = {}
+        self._image_indexes_lock = threading.Lock()
         
         # Validate all datasets
         self._validate_config()
     
     def _validate_config(self):
         """Validate that all configured paths exist."""
-        invalid = []
-        for dataset in self.config.datasets:
-            if not dataset.validate(self.base_path):
-                invalid.append(dataset.name)
+        invalid = self.config.validate_datasets(self.base_path)
         
         if invalid:
             logger.warning(f"Invalid datasets in config: {invalid}")
         else:
             logger.info(f"Configuration valid: {len(self.config.datasets)} datasets")
     
-    def load_dataset(self, dataset_name: str) -> NeighborhoodData:
+    def load_dataset(self, dataset_name: str,
+                     columns: Optional[List[str]] = None) -> NeighborhoodData:
         """
         Load a specific dataset by name.
         
         Args:
             dataset_name: Name of dataset as defined in config
+            columns: Optional attribute columns to keep; ID-like columns and
+                smithsonianNumber are always kept for image matching
             
         Returns:
             NeighborhoodData object with loaded buildings
         """
-        dataset_config = self.config.get_dataset(dataset_name)
-        
-        if not dataset_config:
-            raise ValueError(f"Dataset '{dataset_name}' not found in configuration")
+        csv_path, images_dir = self._dataset_paths(dataset_name)
         
         logger.info(f"Loading dataset: {dataset_name}")
         
-        # Build full paths
-        csv_path = self.base_path / dataset_config.csv_file
-        images_dir = self.base_path / dataset_config.images_dir
+        # Reuse the built table when the source files are unchanged
+        cache_key = (self.cache.make_key(csv_path, images_dir, dataset=dataset_name,
+                                         columns=self.config.columns,
+                                         select=sorted(columns) if columns else None)
+                     if self.use_cache else None)
+        buildings = self.cache.load(cache_key) if cache_key else None
         
-        # Load CSV
-        logger.debug(f"Loading CSV: {csv_path}")
-        df = self.csv_parser.parse_file(str(csv_path))
-        logger.info(f"Loaded {len(df)} records from CSV")
+        if buildings is not None:
+            buildings = _restore_image_lists(buildings)
+            logger.info(f"Loaded {len(buildings)} buildings from cache")
+        else:
+            # Load CSV
+            logger.debug("Loading CSV: {}", csv_path)
+            df = self._read_csv(csv_path)
+            logger.info(f"Loaded {len(df)} records from CSV")
+            
+            if columns:
+                # Drop unneeded columns before they're carried into the building table
+                wanted = set(columns)
+                df = df[[col for col in df.columns if col in wanted or _is_key_column(col)]]
+            
+            # Create image index
+            logger.debug("Building image index: {}", images_dir)
+            image_index = self._get_image_index(images_dir)
+            
+            # Build building table
+            buildings = self._build_building_data(df, image_index, dataset_name)
+            image_index.clear_lookup_cache()
+            
+            if cache_key:
+                self.cache.save(cache_key, buildings)
         
-        # Create image index
-        logger.debug(f"Building image index: {images_dir}")
-        image_index = ImageIndex(str(images_dir))
+        data = NeighborhoodData(name=dataset_name, df=buildings)
         
-        # Build building data
-        buildings = self._build_building_data(df, image_index, dataset_name)
+        logger.info(f"Dataset {dataset_name}: {data.total_buildings} buildings, "
+                   f"{data.buildings_with_images} with images, {data.total_images} total images")
         
-        # Calculate statistics
-        buildings_with_images = sum(1 for info in buildings.values() if info['images'])
-        total_images = sum(len(info['images']) for info in buildings.values())
+        return data
+    
+    def iter_dataset(self, dataset_name: str, chunksize: int = 50_000) -> Iterator[pd.DataFrame]:
+        """
+        Stream a dataset as building tables of bounded size.
         
-        logger.info(f"Dataset {dataset_name}: {len(buildings)} buildings, "
-                   f"{buildings_with_images} with images, {total_images} total images")
+        Unlike load_dataset, only one chunk of buildings is held in memory at a
+        time, so large datasets can be fed to training without loading them
+        whole. The on-disk cache is not used, and the result differs from
+        load_dataset in two ways:
         
-        return NeighborhoodData(
-            name=dataset_name,
-            buildings=buildings,
-            total_buildings=len(buildings),
-            buildings_with_images=buildings_with_images,
-            total_images=total_images
-        )
+        - Column dtypes are inferred per chunk, so a column can be int64 in
+          one chunk and float64 (because of missing values) in the next.
+        - Repeated building IDs are dropped within a chunk only, keeping the
+          last row as load_dataset does; an ID that appears again in a later
+          chunk is yielded again. Consumers that need unique IDs across the
+          whole dataset must drop them themselves.
+        
+        Args:
+            dataset_name: Name of dataset as defined in config
+            chunksize: Maximum number of buildings per chunk
+            
+        Yields:
+            DataFrames with the same layout as NeighborhoodData.df
+        """
+        csv_path, images_dir = self._dataset_paths(dataset_name)
+        
+        logger.info(f"Streaming dataset: {dataset_name}")
+        
+        # One image index serves every chunk
+        image_index = self._get_image_index(images_dir)
+        
+        chunks = self.csv_parser.iter_file(str(csv_path), chunksize=chunksize,
+                                           usecols=self._usecols, dtype=self._dtypes)
+        try:
+            for chunk in chunks:
+                yield self._build_building_data(chunk, image_index, dataset_name)
+        finally:
+            image_index.clear_lookup_cache()
+    
+    def _dataset_paths(self, dataset_name: str) -> Tuple[Path, Path]:
+        """Resolve the CSV path and images directory of a configured dataset."""
+        dataset_config = self.config.get_dataset(dataset_name)
+        
+        if not dataset_config:
+            raise ValueError(f"Dataset '{dataset_name}' not found in configuration")
+        
+        return (self.base_path / dataset_config.csv_file,
+                self.base_path / dataset_config.images_dir)
+    
+    def _get_image_index(self, images_dir: Path) -> ImageIndex:
+        """
+        Return the image index for a directory, scanning it only once.
+        
+        Indexes are read-only once built and are kept for the loader's
+        lifetime; clear_cache() drops them so changed directories are rescanned.
+        """
+        key = str(images_dir.resolve())
+        with self._image_indexes_lock:
+            image_index = self._image_indexes.get(key)
+            if image_index is None:
+                cache_path = str(self.cache.index_path(images_dir)) if self.use_cache else None
+                image_index = self._image_indexes[key] = ImageIndex(str(images_dir), cache_path=cache_path)
+        
+        # Built lazily on first lookup, under the index's own lock, so different
+        # directories still scan in parallel
+        return image_index
+    
+    def _read_csv(self, csv_path: Path) -> pd.DataFrame:
+        """Read a dataset CSV into a DataFrame with the configured columns and dtypes."""
+        return self.csv_parser.parse_file(str(csv_path), usecols=self._usecols, dtype=self._dtypes)
+    
+    def _keep_column(self, column: str) -> bool:
+        """Whether a CSV column is read when columns are declared in config."""
+        return column in self.config.columns or _is_key_column(column)
     
     def load_all_datasets(self) -> Dict[str, NeighborhoodData]:
         """
@@ -127,25 +346,49 @@ class ConfigurableDataLoader:
         Returns:
             Dictionary mapping dataset names to NeighborhoodData
         """
-        results = {}
+        return self._load_datasets([ds.name for ds in self.config.datasets])
+    
+    def _load_datasets(self, names: List[str]) -> Dict[str, NeighborhoodData]:
+        """
+        Load several datasets concurrently, skipping any that fail.
+        
+        Each load is dominated by file I/O (CSV read and image directory scan),
+        so threads let the datasets overlap their disk waits.
         
-        for dataset_config in self.config.datasets:
-            try:
-                result = self.load_dataset(dataset_config.name)
-                results[dataset_config.name] = result
-            except Exception as e:
-                logger.error(f"Failed to load dataset {dataset_config.name}: {e}")
-                continue
+        Args:
+            names: Dataset names as defined in config
+            
+        Returns:
+            Dictionary mapping dataset names to NeighborhoodData, in input order
+        """
+        if not names:
+            return {}
         
-        return results
+        results = {}
+        workers = min(self.MAX_WORKERS, len(names))
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self.load_dataset, name): name for name in names}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to load dataset {name}: {e}")
+        
+        # Preserve configuration order rather than completion order
+        return {name: results[name] for name in names if name in results}
     
-    def load_neighborhood(self, neighborhood: str, merge: bool = True) -> NeighborhoodData:
+    def load_neighborhood(self, neighborhood: str, merge: bool = True,
+                          loaded: Optional[Dict[str, NeighborhoodData]] = None) -> NeighborhoodData:
         """
         Load all datasets for a specific neighborhood.
         
         Args:
             neighborhood: Neighborhood name
             merge: If True, merge multiple style datasets into one
+            loaded: Optional already-loaded datasets (e.g. from load_all_datasets)
+                to reuse instead of loading them again
             
         Returns:
             NeighborhoodData (merged if multiple datasets exist)
@@ -157,15 +400,12 @@ class ConfigurableDataLoader:
         
         logger.info(f"Loading {len(dataset_configs)} dataset(s) for {neighborhood}")
         
-        # Load all datasets for this neighborhood
-        datasets = []
-        for config in dataset_configs:
-            try:
-                data = self.load_dataset(config.name)
-                datasets.append(data)
-            except Exception as e:
-                logger.error(f"Failed to load {config.name}: {e}")
-                continue
+        # Load the datasets for this neighborhood that aren't already loaded
+        names = [config.name for config in dataset_configs]
+        loaded = loaded or {}
+        fresh = self._load_datasets([name for name in names if name not in loaded])
+        datasets = [loaded.get(name) or fresh.get(name) for name in names]
+        datasets = [dataset for dataset in datasets if dataset is not None]
         
         if not datasets:
             raise RuntimeError(f"Failed to load any datasets for {neighborhood}")
@@ -181,80 +421,110 @@ class ConfigurableDataLoader:
     def _merge_datasets(self, datasets: List[NeighborhoodData], 
                        neighborhood: str) -> NeighborhoodData:
         """Merge multiple NeighborhoodData objects into one."""
-        merged_buildings = {}
-        
-        for dataset in datasets:
-            for building_id, building_info in dataset.buildings.items():
-                if building_id in merged_buildings:
-                    # Conflict: same building ID in multiple datasets
-                    logger.warning(f"Duplicate building ID {building_id} in {dataset.name}")
-                    # Create unique key
-                    unique_key = f"{building_id}_{dataset.name}"
-                    merged_buildings[unique_key] = building_info
-                else:
-                    merged_buildings[building_id] = building_info
-        
-        # Calculate merged statistics
-        buildings_with_images = sum(1 for info in merged_buildings.values() if info['images'])
-        total_images = sum(len(info['images']) for info in merged_buildings.values())
-        
-        logger.info(f"Merged {neighborhood}: {len(merged_buildings)} buildings, "
-                   f"{buildings_with_images} with images")
-        
-        return NeighborhoodData(
-            name=neighborhood,
-            buildings=merged_buildings,
-            total_buildings=len(merged_buildings),
-            buildings_with_images=buildings_with_images,
-            total_images=total_images
-        )
+        merged = pd.concat([dataset.df for dataset in datasets])
+        
+        # Conflict: same building ID in multiple datasets gets a unique key
+        duplicated = merged.index.duplicated(keep='first')
+        if duplicated.any():
+            duplicate_ids = merged.index[duplicated]
+            logger.warning(f"{len(duplicate_ids)} duplicate building IDs in {neighborhood}: "
+                           f"{list(duplicate_ids[:10])}")
+            unique_keys = merged.index + '_' + merged[DATASET_COLUMN].to_numpy()
+            merged.index = merged.index.where(~duplicated, unique_keys)
+        
+        data = NeighborhoodData(name=neighborhood, df=merged)
+        
+        logger.info(f"Merged {neighborhood}: {data.total_buildings} buildings, "
+                   f"{data.buildings_with_images} with images")
+        
+        return data
     
     def _build_building_data(self, df: pd.DataFrame, image_index: ImageIndex,
-                            dataset_name: str) -> Dict[str, Dict[str, Any]]:
-        """Build building data dictionary from DataFrame."""
-        buildings = {}
-        
+                            dataset_name: str) -> pd.DataFrame:
+        """Build the building table (attributes plus matched images) from a DataFrame."""
         # Find ID column
-        id_column = self._find_id_column(df)
+        id_column = _find_id_column(tuple(df.columns))
         if not id_column:
             logger.error(f"No ID column found in {dataset_name}. Columns: {list(df.columns)}")
-            return {}
+            return pd.DataFrame(columns=BUILDING_COLUMNS, index=pd.Index([], name='building_id'))
         
-        logger.debug(f"Using ID column: {id_column}")
-        
-        for idx, row in df.iterrows():
-            try:
-                building_id = str(row[id_column])
-                smithsonian = str(row.get('smithsonianNumber', '')).strip()
-                
-                # Find images for this building
-                images = image_index.find_images(building_id, smithsonian)
-                
-                buildings[building_id] = {
-                    'attributes': row,
-                    'images': images,
-                    'dataset': dataset_name
-                }
-                
-            except Exception as e:
-                logger.warning(f"Skipping row {idx} in {dataset_name}: {e}")
-                continue
+        logger.debug("Using ID column: {}", id_column)
+        
+        # Rows without an ID can't be keyed or matched; drop them in one pass
+        missing_ids = df[id_column].isna()
+        if missing_ids.any():
+            logger.warning(f"Skipping {int(missing_ids.sum())} rows without {id_column} in {dataset_name}")
+            df = df[~missing_ids]
         
-        return buildings
+        # Coerce both key columns once, column-wise; missing numbers become ''
+        building_ids = df[id_column].astype(str).to_numpy()
+        if 'smithsonianNumber' in df.columns:
+            smithsonians = df['smithsonianNumber'].fillna('').astype(str).str.strip().to_numpy()
+        else:
+            smithsonians = np.full(len(df), '', dtype=object)
+        
+        # Match images for all buildings in one vectorized pass
+        matched_images = image_index.find_images_bulk(building_ids, smithsonians)
+        
+        index = pd.Index(building_ids, name='building_id')
+        buildings = df.set_axis(index, axis=0).assign(**{
+            IMAGE_PATHS_COLUMN: pd.Series(matched_images, index=index, dtype=object),
+            N_IMAGES_COLUMN: [len(images) for images in matched_images],
+            DATASET_COLUMN: dataset_name,
+        })
+        
+        # A repeated ID keeps its last row, as the dict-based layout did
+        return buildings[~buildings.index.duplicated(keep='last')]
     
-    def _find_id_column(self, df: pd.DataFrame) -> Optional[str]:
-        """Find the appropriate ID column in DataFrame."""
-        # Try exact match first
-        if 'id' in df.columns:
-            return 'id'
+    def clear_cache(self) -> None:
+        """Remove all cached datasets from the cache directory and memory."""
+        self.cache.clear()
+        with self._image_indexes_lock:
+            self._image_indexes.clear()
+    
+    def save_cache(self, data: Dict[str, NeighborhoodData], path: str) -> None:
+        """
+        Save loaded datasets to a directory as zstd-compressed Parquet.
         
-        # Look for columns containing 'id' (case-insensitive)
-        id_columns = [col for col in df.columns if 'id' in col.lower()]
-        if id_columns:
-            logger.debug(f"Found ID columns: {id_columns}, using {id_columns[0]}")
-            return id_columns[0]
+        Each dataset is written to its own file, with image paths stored as a
+        list column, alongside a summary table with one row per dataset.
         
-        return None
+        Args:
+            data: Dictionary of loaded NeighborhoodData objects
+            path: Output directory (created if missing)
+        """
+        out_dir = Path(path)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        
+        for name, dataset in data.items():
+            dataset.df.to_parquet(out_dir / f"{name}.parquet", compression=PARQUET_COMPRESSION)
+        
+        summary = pd.DataFrame.from_dict(self.get_summary(data)['datasets'], orient='index')
+        summary.index.name = 'name'
+        summary.to_parquet(out_dir / SUMMARY_FILE, compression=PARQUET_COMPRESSION)
+        
+        logger.info(f"Saved {len(data)} datasets to {out_dir}")
+    
+    def load_cache(self, path: str) -> Dict[str, NeighborhoodData]:
+        """
+        Load datasets previously written by save_cache.
+        
+        Args:
+            path: Directory passed to save_cache
+            
+        Returns:
+            Dictionary mapping dataset names to NeighborhoodData
+        """
+        in_dir = Path(path)
+        summary = pd.read_parquet(in_dir / SUMMARY_FILE)
+        
+        data = {}
+        for name in summary.index:
+            buildings = _restore_image_lists(pd.read_parquet(in_dir / f"{name}.parquet"))
+            data[name] = NeighborhoodData(name=name, df=buildings)
+        
+        logger.info(f"Loaded {len(data)} datasets from {in_dir}")
+        return data
     
     def list_datasets(self) -> List[str]:
         """Get list of all dataset names in configuration."""
@@ -286,9 +556,18 @@ class ConfigurableDataLoader:
         Returns:
             Dictionary with summary statistics
         """
-        total_buildings = sum(d.total_buildings for d in data.values())
-        total_buildings_with_images = sum(d.buildings_with_images for d in data.values())
-        total_images = sum(d.total_images for d in data.values())
+        # One row per dataset; all totals come from a single reduction
+        stats = pd.DataFrame(
+            [(d.total_buildings, d.buildings_with_images, d.total_images) for d in data.values()],
+            index=list(data.keys()),
+            columns=['buildings', 'buildings_with_images', 'total_images']
+        )
+        totals = stats.sum()
+        coverage = (stats['buildings_with_images'] / stats['buildings'] * 100).where(stats['buildings'] > 0, 0.0)
+        
+        total_buildings = int(totals['buildings'])
+        total_buildings_with_images = int(totals['buildings_with_images'])
+        total_images = int(totals['total_images'])
         
         return {
             'total_datasets': len(data),
@@ -299,12 +578,12 @@ class ConfigurableDataLoader:
             'average_images_per_building': (total_images / total_buildings) if total_buildings > 0 else 0.0,
             'datasets': {
                 name: {
-                    'buildings': d.total_buildings,
-                    'buildings_with_images': d.buildings_with_images,
-                    'total_images': d.total_images,
-                    'coverage': (d.buildings_with_images / d.total_buildings * 100) if d.total_buildings > 0 else 0.0
+                    'buildings': int(row.buildings),
+                    'buildings_with_images': int(row.buildings_with_images),
+                    'total_images': int(row.total_images),
+                    'coverage': float(coverage[name])
                 }
-                for name, d in data.items()
+                for name, row in zip(stats.index, stats.itertuples(index=False))
             }
         }
     
@@ -319,16 +598,17 @@ class ConfigurableDataLoader:
         logger.info("DATA LOADING SUMMARY")
         logger.info("=" * 60)
         
+        # One pass over the data; both sections below read from the summary
+        summary = self.get_summary(data)
+        
         # Per-dataset statistics
-        for name, dataset in data.items():
-            coverage = (dataset.buildings_with_images / dataset.total_buildings * 100) if dataset.total_buildings > 0 else 0.0
+        for name, stats in summary['datasets'].items():
             logger.info(f"\n📊 {name}:")
-            logger.info(f"  Buildings: {dataset.total_buildings}")
-            logger.info(f"  Buildings with images: {dataset.buildings_with_images} ({coverage:.1f}%)")
-            logger.info(f"  Total images: {dataset.total_images}")
+            logger.info(f"  Buildings: {stats['buildings']}")
+            logger.info(f"  Buildings with images: {stats['buildings_with_images']} ({stats['coverage']:.1f}%)")
+            logger.info(f"  Total images: {stats['total_images']}")
         
         # Overall statistics
-        summary = self.get_summary(data)
         logger.info("\n" + "=" * 60)
         logger.success(f"✅ TOTAL: {summary['total_datasets']} datasets")
         logger.success(f"   Buildings: {summary['total_buildings']}")
@@ -3,39 +3,93 @@ CSV parsing utilities for handling messy historical data files.
 """
 
 import csv
+import io
+import os
 from io import StringIO
-from typing import List, Optional
+from itertools import islice
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import re
 import pandas as pd
 from loguru import logger
 
 
+# Read-only so a parser shared between loader threads can't change under them
+QUOTE_REPLACEMENTS = (
+    ('\u201c', '"'), ('\u201d', '"'), ('\u201e', '"'),  # Curly quotes to straight
+    ('\u2018', "'"), ('\u2019', "'"),  # Curly apostrophes to straight
+)
+
+
 class CSVParseError(Exception):
     """Custom exception for CSV parsing errors."""
     pass
 
 
+class _CleanedLineStream(io.RawIOBase):
+    """
+    Read-only byte stream over cleaned CSV lines.
+    
+    Lines are pulled and encoded in blocks as the reader consumes the stream,
+    so pandas can parse a file without the whole text being held in memory.
+    """
+    
+    BLOCK_LINES = 1024
+    
+    def __init__(self, source: IO[str], lines: Iterator[str]):
+        self._source = source  # Closed with the stream
+        self._lines = lines
+        self._block = b''
+        self._pos = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        if self._pos >= len(self._block):
+            self._block = ''.join(line + '\n' for line in islice(self._lines, self.BLOCK_LINES)).encode('utf-8')
+            self._pos = 0
+            if not self._block:
+                return 0
+        
+        n = min(len(buffer), len(self._block) - self._pos)
+        buffer[:n] = self._block[self._pos:self._pos + n]
+        self._pos += n
+        return n
+    
+    def close(self) -> None:
+        self._source.close()
+        super().close()
+
+
 class RobustCSVParser:
     """
     Handles robust CSV parsing with error recovery for historical data files.
+    
+    Parsing keeps no per-file state on the instance, so one parser can be
+    shared by threads loading different files.
     """
     
-    def __init__(self, field_tolerance: int = 10, preview_length: int = 200):
+    def __init__(self, field_tolerance: int = 10, preview_length: int = 200,
+                 read_buffer_size: int = 1 << 20):
         # Configurable constants (can be overridden)
-        self.FIELD_TOLERANCE = field_tolerance  # Allow extra fields beyond expected
-        self.PREVIEW_LENGTH = preview_length    # Characters to show in error previews
-        
-        self.quote_replacements = [
-            ('"', '"'), ('"', '"'), ('"', '"'),  # Curly quotes to straight
-            (''', "'"), (''', "'")  # Curly apostrophes to straight
-        ]
+        self.FIELD_TOLERANCE = field_tolerance    # Allow extra fields beyond expected
+        self.PREVIEW_LENGTH = preview_length      # Characters to show in error previews
+        self.READ_BUFFER_SIZE = read_buffer_size  # Bytes per read() syscall
     
-    def parse_file(self, file_path: str) -> pd.DataFrame:
+    @property
+    def quote_replacements(self) -> Tuple[Tuple[str, str], ...]:
+        """Quote replacements applied while cleaning lines (read-only)."""
+        return QUOTE_REPLACEMENTS
+    
+    def parse_file(self, file_path: str, usecols: Optional[Callable[[str], bool]] = None,
+                   dtype: Optional[Dict[str, str]] = None) -> pd.DataFrame:
         """
         Parse a CSV file with robust error handling.
         
         Args:
             file_path: Path to the CSV file
+            usecols: Optional predicate selecting the columns to keep
+            dtype: Optional mapping of column name to dtype
             
         Returns:
             Parsed DataFrame
@@ -46,38 +100,116 @@ class RobustCSVParser:
         logger.info(f"Parsing CSV file: {file_path}")
         
         try:
-            lines = self._read_and_clean_file(file_path)
-            return self._parse_with_pandas(lines)
+            df = self._parse_with_pandas(file_path, dtype=dtype)
         except Exception as e:
             logger.warning(f"Standard parsing failed: {e}")
-            return self._parse_with_fallback(lines)
+            lines = self._read_and_clean_file(file_path)
+            df = self._parse_with_fallback(lines, dtype=dtype)
+        
+        return self._select_columns(df, usecols)
     
-    def _read_and_clean_file(self, file_path: str) -> List[str]:
-        """Read file and perform basic cleaning."""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = [line for line in f if not line.strip().startswith('//')]
+    def iter_file(self, file_path: str, chunksize: int = 50_000,
+                  usecols: Optional[Callable[[str], bool]] = None,
+                  dtype: Optional[Dict[str, str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Parse a CSV file as a stream of DataFrames.
+        
+        Args:
+            file_path: Path to the CSV file
+            chunksize: Maximum number of rows per DataFrame
+            usecols: Optional predicate selecting the columns to keep
+            dtype: Optional mapping of column name to dtype
+            
+        Yields:
+            DataFrames of at most chunksize rows
+        """
+        logger.info(f"Parsing CSV file in chunks of {chunksize}: {file_path}")
         
-        # Replace problematic quotes
-        clean_lines = []
+        # Chunks are parsed lazily and can't be retried, so only the C engine is used
+        with self._open_cleaned(file_path) as stream, pd.read_csv(
+            stream,
+            delimiter='\t',
+            engine='c',
+            on_bad_lines='skip',
+            quoting=csv.QUOTE_MINIMAL,
+            chunksize=chunksize,
+            dtype=dtype
+        ) as reader:
+            for chunk in reader:
+                yield self._select_columns(chunk, usecols)
+    
+    def _select_columns(self, df: pd.DataFrame,
+                        usecols: Optional[Callable[[str], bool]]) -> pd.DataFrame:
+        """Keep only the selected columns."""
+        # Applied after parsing: passing usecols to read_csv makes pandas accept
+        # rows with too many fields instead of skipping them as bad lines
+        if usecols is None:
+            return df
+        return df[[col for col in df.columns if usecols(col)]]
+    
+    def _open_sequential(self, file_path: str) -> IO[str]:
+        """Open a text file for a single front-to-back read."""
+        f = open(file_path, 'r', encoding='utf-8', buffering=self.READ_BUFFER_SIZE)
+        if hasattr(os, 'posix_fadvise'):
+            # Whole file is read front to back; let the kernel read ahead aggressively
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        return f
+    
+    def _open_cleaned(self, file_path: str) -> io.BufferedReader:
+        """Open a file as a byte stream of its cleaned lines."""
+        f = self._open_sequential(file_path)
+        return io.BufferedReader(_CleanedLineStream(f, self._clean_lines(f)), self.READ_BUFFER_SIZE)
+    
+    def _clean_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """Drop comment lines and replace problematic quotes."""
         for line in lines:
             cleaned = line.strip()
-            for old_char, new_char in self.quote_replacements:
-                cleaned = cleaned.replace(old_char, new_char)
-            clean_lines.append(cleaned)
-        
-        return clean_lines
+            if cleaned.startswith('//'):
+                continue
+            # Every replaced quote is non-ASCII, so most lines need no work;
+            # chained replace beats translate on the ones that do
+            if not cleaned.isascii():
+                for old, new in QUOTE_REPLACEMENTS:
+                    cleaned = cleaned.replace(old, new)
+            yield cleaned
     
-    def _parse_with_pandas(self, lines: List[str]) -> pd.DataFrame:
-        """Attempt standard pandas parsing."""
-        return pd.read_csv(
-            StringIO('\n'.join(lines)),
-            delimiter='\t',
-            engine='python',
+    def _read_and_clean_file(self, file_path: str) -> List[str]:
+        """Read file and perform basic cleaning."""
+        with self._open_sequential(file_path) as f:
+            return list(self._clean_lines(f))
+    
+    def _parse_with_pandas(self, file_path: str,
+                           dtype: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """Attempt standard pandas parsing, streaming cleaned lines from disk."""
+        return self._read_tsv(
+            lambda: self._open_cleaned(file_path),
             on_bad_lines='skip',
-            quoting=csv.QUOTE_MINIMAL
+            quoting=csv.QUOTE_MINIMAL,
+            dtype=dtype
         )
     
-    def _parse_with_fallback(self, lines: List[str]) -> pd.DataFrame:
+    def _read_tsv(self, open_source: Callable[[], IO], **kwargs) -> pd.DataFrame:
+        """
+        Read tab-separated data with the C engine, retrying with the python engine.
+        
+        The C engine gives the same results as the python engine on these files
+        at a fraction of the cost. The pyarrow engine is not used because it
+        drops rows with fewer fields instead of padding them.
+        
+        Args:
+            open_source: Returns a fresh file-like object each time it's called
+            **kwargs: Extra pd.read_csv arguments
+        """
+        try:
+            with open_source() as source:
+                return pd.read_csv(source, delimiter='\t', engine='c', low_memory=False, **kwargs)
+        except pd.errors.ParserError as e:
+            logger.debug("C parser failed ({}), retrying with the python engine", e)
+            with open_source() as source:
+                return pd.read_csv(source, delimiter='\t', engine='python', **kwargs)
+    
+    def _parse_with_fallback(self, lines: List[str],
+                             dtype: Optional[Dict[str, str]] = None) -> pd.DataFrame:
         """Fallback parsing with manual line filtering."""
         if not lines:
             raise CSVParseError("No lines to parse")
@@ -89,32 +221,40 @@ class RobustCSVParser:
         logger.info(f"Expected columns: {expected_cols}")
         
         filtered_lines = [header_line]
-        skipped_count = 0
+        skipped_lines = []
         
         for i, line in enumerate(data_lines, 1):
             if self._is_line_valid(line, expected_cols):
                 filtered_lines.append(line)
             else:
-                logger.debug(f"Skipping malformed line {i+1}")
-                skipped_count += 1
+                skipped_lines.append(i + 1)
         
-        logger.info(f"Filtered {len(lines)} to {len(filtered_lines)} lines (skipped {skipped_count})")
+        logger.info(f"Filtered {len(lines)} to {len(filtered_lines)} lines (skipped {len(skipped_lines)})")
+        if skipped_lines:
+            # One summary instead of a message per line; formatted only at DEBUG
+            logger.debug("Skipped malformed lines: {}", skipped_lines)
         
+        text = '\n'.join(filtered_lines)
         try:
-            return pd.read_csv(
-                StringIO('\n'.join(filtered_lines)),
-                delimiter='\t',
-                engine='python'
-            )
+            return self._read_tsv(lambda: StringIO(text), dtype=dtype)
         except Exception as e:
             raise CSVParseError(f"All parsing attempts failed: {e}")
     
     def _is_line_valid(self, line: str, expected_cols: int) -> bool:
         """Check if a line can be parsed and has reasonable field count."""
+        max_fields = expected_cols + self.FIELD_TOLERANCE
+        
+        # Quoting can only merge tab-separated pieces, so tabs + 1 bounds the
+        # field count; without quotes it is exact and csv.reader isn't needed
+        if line and line.count('\t') + 1 <= max_fields:
+            return True
+        if '"' not in line:
+            return False
+        
         try:
             test_reader = csv.reader(StringIO(line), delimiter='\t', quotechar='"')
             fields = next(test_reader)
             field_count = len(fields)
-            return field_count <= expected_cols + self.FIELD_TOLERANCE
+            return field_count <= max_fields
         except Exception:
             return False
@@ -0,0 +1,154 @@
+"""
+On-disk caching for loaded datasets.
+
+Building tables (CSV attributes plus matched image paths) are stored under a
+cache directory as zstd-compressed Parquet, keyed on the paths, sizes and
+modification times of their source files, so unchanged datasets skip CSV
+parsing, directory scans and image matching on later runs. Image indexes are
+cached alongside them so a changed CSV doesn't force a directory rescan.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Optional, Tuple
+import pandas as pd
+from loguru import logger
+
+
+# Bump when the cached artifacts change shape or content so stale entries are ignored
+CACHE_VERSION = 4
+
+# Columnar and typed; zstd keeps entries small and fast to decompress
+PARQUET_COMPRESSION = 'zstd'
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'arepas'
+
+
+class DatasetCache:
+    """
+    Stores building tables on disk as zstd-compressed Parquet files, and
+    locates the image index cache files that ImageIndex maintains.
+    
+    Writes are best-effort: any failure to write an entry is logged and the
+    dataset is simply parsed again next time.
+    """
+    
+    TABLE_SUFFIX = '.parquet'
+    INDEX_SUFFIX = '.images.pkl'
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+    
+    def make_key(self, csv_path: Path, images_dir: Path, **options: Any) -> Optional[str]:
+        """
+        Build a cache key from source file metadata.
+        
+        Args:
+            csv_path: Path to the dataset CSV
+            images_dir: Path to the dataset images directory
+            **options: Read options that change the parsed table (JSON-serializable)
+        
+        Returns:
+            Hex digest key, or None if either source cannot be stat'ed
+        """
+        try:
+            csv_stat = os.stat(csv_path)
+            img_stat = os.stat(images_dir)
+        except OSError:
+            return None
+        
+        # The directory mtime changes whenever files are added, removed or renamed
+        parts = [
+            str(CACHE_VERSION),
+            str(Path(csv_path).resolve()), str(csv_stat.st_mtime_ns), str(csv_stat.st_size),
+            str(Path(images_dir).resolve()), str(img_stat.st_mtime_ns),
+            json.dumps(options, sort_keys=True),
+        ]
+        return hashlib.md5('\0'.join(parts).encode('utf-8')).hexdigest()
+    
+    def index_path(self, images_dir: Path) -> Path:
+        """
+        Path of the image index cache file for a directory.
+        
+        ImageIndex reads and writes this file itself and checks the directory's
+        mtime on load, so one file per directory is enough.
+        
+        Args:
+            images_dir: Path to the dataset images directory
+            
+        Returns:
+            Cache file path
+        """
+        parts = [str(CACHE_VERSION), str(Path(images_dir).resolve())]
+        key = hashlib.md5('\0'.join(parts).encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{key}{self.INDEX_SUFFIX}"
+    
+    def load(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Load a cached building table.
+        
+        Args:
+            key: Cache key from make_key
+            
+        Returns:
+            DataFrame on a hit, None on a miss
+        """
+        table_path = self.cache_dir / f"{key}{self.TABLE_SUFFIX}"
+        
+        if not table_path.exists():
+            return None
+        
+        try:
+            df = pd.read_parquet(table_path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {key}: {e}")
+            return None
+        
+        logger.debug("Cache hit: {}", key)
+        return df
+    
+    def save(self, key: str, df: pd.DataFrame) -> None:
+        """
+        Store a building table under a cache key.
+        
+        Args:
+            key: Cache key from make_key
+            df: Building table to store
+        """
+        table_path = self.cache_dir / f"{key}{self.TABLE_SUFFIX}"
+        
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see partial entries
+            tmp_table = table_path.with_name(table_path.name + '.tmp')
+            df.to_parquet(tmp_table, compression=PARQUET_COMPRESSION)
+            os.replace(tmp_table, table_path)
+            logger.debug("Cached dataset as {}", key)
+        except Exception as e:
+            logger.warning(f"Could not write cache entry {key}: {e}")
+    
+    def _suffixes(self) -> Tuple[str, ...]:
+        """File suffixes owned by the cache, including interrupted writes."""
+        suffixes = (self.TABLE_SUFFIX, self.INDEX_SUFFIX)
+        return suffixes + tuple(suffix + '.tmp' for suffix in suffixes)
+    
+    def clear(self) -> int:
+        """
+        Remove all cache entries written by this class.
+        
+        Returns:
+            Number of files removed
+        """
+        if not self.cache_dir.exists():
+            return 0
+        
+        removed = 0
+        for path in self.cache_dir.iterdir():
+            if path.name.endswith(self._suffixes()):
+                path.unlink()
+                removed += 1
+        
+        logger.info(f"Cleared {removed} cache files from {self.cache_dir}")
+        return removed
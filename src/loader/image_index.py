@@ -3,21 +3,58 @@ Image indexing and pattern matching utilities.
 """
 
 import os
-from typing import Dict, List, Set
+import pickle
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import pandas as pd
 from loguru import logger
 
 
+# Smithsonian values that mean "no number"
+MISSING_SMITHSONIAN = ('nan', 'null', 'None', '')
+
+
 class ImageIndex:
     """
     Manages image file indexing and pattern matching for fast lookups.
     """
     
-    def __init__(self, images_dir: str, image_extensions: set = None):
+    def __init__(self, images_dir: str, image_extensions: set = None,
+                 cache_path: Optional[str] = None):
         self.images_dir = images_dir
-        # Configurable image extensions
+        # Optional pickle of the built index, reused while the directory is unchanged
+        self.cache_path = cache_path
+        # Configurable image extensions (matched case-insensitively)
         self.IMAGE_EXTENSIONS = image_extensions or {'.jpg', '.jpeg', '.png', '.JPG', '.JPEG', '.PNG'}
-        self._index: Dict[str, List[str]] = {}
+        # Key -> paths; a dict acts as an insertion-ordered set for O(1) dedup
+        self._index: Dict[str, Dict[str, None]] = defaultdict(dict)
+        # Sorted keys for prefix range lookups, set once the index is built
+        self._sorted_keys: Tuple[str, ...] = ()
+        # Memoized prefix lookups; many buildings share the same missed pattern.
+        # Scoped to one dataset load: the loader calls clear_lookup_cache()
+        self._prefix_cache: Dict[str, List[str]] = {}
         self._built = False
+        self._build_lock = threading.Lock()
+    
+    @classmethod
+    def build(cls, images_dir: str, image_extensions: set = None,
+              cache_path: Optional[str] = None) -> 'ImageIndex':
+        """
+        Create an index and scan its directory immediately.
+        
+        Args:
+            images_dir: Directory containing the images
+            image_extensions: Optional set of image file extensions
+            cache_path: Optional file to load the index from and save it to
+            
+        Returns:
+            Fully populated ImageIndex
+        """
+        index = cls(images_dir, image_extensions, cache_path)
+        index._build_index()
+        return index
     
     def find_images(self, building_id: str, smithsonian: str = None) -> List[str]:
         """
@@ -36,37 +73,230 @@ class ImageIndex:
         patterns = self._generate_patterns(building_id, smithsonian)
         return self._search_by_patterns(patterns)
     
+    def find_images_bulk(self, building_ids: Sequence[str],
+                         smithsonians: Sequence[str]) -> List[List[str]]:
+        """
+        Find images for many buildings at once.
+        
+        Produces the same results as calling find_images for each building, but
+        resolves each distinct search pattern only once (see bulk_lookup) and
+        assembles the per-building lists with a single pandas join.
+        
+        Args:
+            building_ids: Primary building identifiers
+            smithsonians: Smithsonian numbers aligned with building_ids
+            
+        Returns:
+            List of image path lists, aligned with building_ids
+        """
+        patterns = self._generate_pattern_frame(building_ids, smithsonians)
+        found = self.bulk_lookup(patterns['key'])
+        if not found:
+            return [[] for _ in range(len(building_ids))]
+        
+        # rank keeps each key's paths in index order; merge doesn't preserve it
+        hits = pd.DataFrame({
+            'key': pd.Series([key for key, paths in found.items() for _ in paths], dtype=str),
+            'path': pd.Series([path for paths in found.values() for path in paths], dtype=str),
+            'rank': [rank for paths in found.values() for rank in range(len(paths))],
+        })
+        
+        matched = (
+            patterns.merge(hits, on='key', how='inner', sort=False)
+            .sort_values(['building', 'order', 'rank'], kind='stable')
+            .drop_duplicates(['building', 'path'])
+            .groupby('building', sort=False)['path']
+            .agg(list)
+        )
+        
+        return [matched.get(building, []) for building in range(len(building_ids))]
+    
+    def bulk_lookup(self, patterns: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Resolve many search patterns against the index in one pass.
+        
+        Each distinct pattern is looked up once: a direct key hit returns that
+        key's images, anything else falls back to a prefix match, exactly as
+        find_images does per pattern.
+        
+        Args:
+            patterns: Search patterns (duplicates are resolved once)
+            
+        Returns:
+            Dictionary mapping each pattern that matched to its image paths
+        """
+        if not self._built:
+            self._build_index()
+        
+        found = {}
+        for pattern in dict.fromkeys(patterns):
+            paths = self._index.get(pattern)
+            matches = list(paths) if paths is not None else self._prefix_matches(pattern)
+            if matches:
+                found[pattern] = matches
+        return found
+    
+    def _generate_pattern_frame(self, building_ids: Sequence[str],
+                                smithsonians: Sequence[str]) -> pd.DataFrame:
+        """
+        Vectorized _generate_patterns for many buildings.
+        
+        Returns:
+            DataFrame with one (building, order, key) row per search pattern,
+            where order ranks patterns within a building by priority
+        """
+        ids = pd.Series(building_ids, dtype=str)
+        smiths = pd.Series(smithsonians, dtype=str)
+        buildings = pd.Series(range(len(ids)))
+        
+        has_smithsonian = ~smiths.isin(MISSING_SMITHSONIAN)
+        is_5dv = ids.str.startswith('5DV.')
+        
+        # Same patterns and priority as _generate_patterns, built column-wise
+        pattern_sets = [
+            (0, has_smithsonian, smiths),
+            (1, has_smithsonian & smiths.str.contains('_', regex=False), smiths + '_'),
+            (2, None, ids),
+            (3, is_5dv & ids.str.contains('_', regex=False), ids + '_'),
+        ]
+        frames = [
+            pd.DataFrame({
+                'building': buildings if mask is None else buildings[mask],
+                'order': order,
+                'key': keys if mask is None else keys[mask],
+            })
+            for order, mask, keys in pattern_sets
+        ]
+        return pd.concat(frames, ignore_index=True)
+    
+    def clear_lookup_cache(self) -> None:
+        """
+        Drop the memoized prefix lookups.
+        
+        An index can be shared by several datasets, so the loader clears the
+        memo after each dataset instead of keeping every pattern ever looked up.
+        """
+        self._prefix_cache.clear()
+    
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Return the index as a long DataFrame with one row per (key, path) pair.
+        
+        Returns:
+            DataFrame with 'key' and 'path' columns
+        """
+        if not self._built:
+            self._build_index()
+        
+        keys = []
+        paths = []
+        for key, key_paths in self._index.items():
+            keys.extend([key] * len(key_paths))
+            paths.extend(key_paths)
+        
+        return pd.DataFrame({'key': pd.Series(keys, dtype=str), 'path': pd.Series(paths, dtype=str)})
+    
     def _build_index(self) -> None:
         """Build the image index for fast lookups."""
         if self._built:
             return
         
-        logger.debug(f"Building image index for: {self.images_dir}")
+        # Indexes can be shared between loader threads; only one of them scans
+        with self._build_lock:
+            if self._built:
+                return
+            
+            # Taken before scanning so changes made during the scan invalidate it
+            state = self._cache_state() if self.cache_path else None
+            if state and self._load_cached(state):
+                return
+            
+            self._scan_images()
+            if state and self._built:
+                self._save_cached(state)
+    
+    def _cache_state(self) -> Optional[Tuple]:
+        """Directory state a cached index must match, or None if it can't be read."""
+        try:
+            mtime_ns = os.stat(self.images_dir).st_mtime_ns
+        except OSError:
+            return None
+        # The directory mtime changes whenever files are added, removed or renamed
+        return (self.images_dir, mtime_ns, sorted(ext.lower() for ext in self.IMAGE_EXTENSIONS))
+    
+    def _load_cached(self, state: Tuple) -> bool:
+        """Load the index from cache_path if it was built from the same directory state."""
+        if not os.path.exists(self.cache_path):
+            return False
+        
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cached = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable image index cache {self.cache_path}: {e}")
+            return False
+        
+        if cached.get('state') != state:
+            return False
+        
+        self._index = cached['index']
+        self._finish_build()
+        logger.info(f"Loaded index with {len(self._index)} entries for "
+                    f"{os.path.basename(self.images_dir)} from cache")
+        return True
+    
+    def _save_cached(self, state: Tuple) -> None:
+        """Atomically write the built index to cache_path (best-effort)."""
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({'state': state, 'index': self._index}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.warning(f"Could not write image index cache {self.cache_path}: {e}")
+    
+    def _finish_build(self) -> None:
+        """Prepare lookup structures once the index is populated."""
+        # Plain dict from here on so lookups of missing keys can't insert them
+        self._index = dict(self._index)
+        self._sorted_keys = tuple(sorted(self._index))
+        self._prefix_cache.clear()
+        self._built = True
+    
+    def _scan_images(self) -> None:
+        """Scan the images directory and index every image file."""
+        logger.debug("Building image index for: {}", self.images_dir)
         
         try:
-            all_files = os.listdir(self.images_dir)
-            image_files = [f for f in all_files if self._is_image_file(f)]
+            # Single scandir pass; DirEntry.is_file() uses cached d_type, no extra stat
+            extensions = {ext.lower() for ext in self.IMAGE_EXTENSIONS}
+            with os.scandir(self.images_dir) as entries:
+                image_files = [
+                    (entry.name, entry.path) for entry in entries
+                    if entry.is_file() and self._is_image_file(entry.name, extensions)
+                ]
             
             logger.info(f"Found {len(image_files)} images in {os.path.basename(self.images_dir)}")
             
-            for filename in image_files:
-                self._index_file(filename)
+            for filename, full_path in image_files:
+                self._index_file(filename, full_path)
                 
-            self._built = True
+            self._finish_build()
             logger.info(f"Built index with {len(self._index)} entries")
             
         except Exception as e:
             logger.error(f"Error building image index: {e}")
-            self._index = {}
+            self._index = defaultdict(dict)
     
-    def _is_image_file(self, filename: str) -> bool:
-        """Check if file is an image based on extension."""
-        return any(filename.endswith(ext) for ext in self.IMAGE_EXTENSIONS)
+    def _is_image_file(self, filename: str, extensions: Set[str]) -> bool:
+        """Check if file is an image based on its extension (lowercased, with dot)."""
+        _, dot, ext = filename.rpartition('.')
+        return bool(dot) and '.' + ext.lower() in extensions
     
-    def _index_file(self, filename: str) -> None:
+    def _index_file(self, filename: str, full_path: str) -> None:
         """Index a single image file with multiple lookup keys."""
         name_without_ext = os.path.splitext(filename)[0]
-        full_path = os.path.join(self.images_dir, filename)
         
         # Index by full filename (without extension)
         self._add_to_index(name_without_ext, full_path)
@@ -79,10 +309,7 @@ class ImageIndex:
     
     def _add_to_index(self, key: str, path: str) -> None:
         """Add a path to the index under a specific key."""
-        if key not in self._index:
-            self._index[key] = []
-        if path not in self._index[key]:
-            self._index[key].append(path)
+        self._index[key][path] = None
     
     def _index_by_underscore_parts(self, name: str, full_path: str) -> None:
         """Index by underscore-separated parts."""
@@ -95,30 +322,36 @@ class ImageIndex:
         """Index by dot-separated parts for smithsonian numbers."""
         dot_parts = name.split('.')
         if len(dot_parts) > 1:
-            # Index by progressive combinations (5DV, 5DV.1011, 5DV.1011.xyz)
-            for i in range(1, len(dot_parts) + 1):
-                prefix = '.'.join(dot_parts[:i])
+            # Index by progressive combinations (5DV, 5DV.1011, 5DV.1011.xyz),
+            # extending the previous prefix rather than re-joining the parts
+            prefix = dot_parts[0]
+            self._add_to_index(prefix, full_path)
+            for part in dot_parts[1:]:
+                prefix = f"{prefix}.{part}"
                 self._add_to_index(prefix, full_path)
     
     def _generate_patterns(self, building_id: str, smithsonian: str = None) -> List[str]:
-        """Generate search patterns ordered by likelihood of success."""
+        """
+        Generate search patterns ordered by likelihood of success.
+        
+        An "X_" prefix pattern is only needed when X itself contains '_'.
+        Otherwise every file named "X_..." is already indexed under X (its
+        first underscore part), so the pattern could never add an image.
+        """
         patterns = []
         
         # Try smithsonian patterns first (most specific)
-        if smithsonian and smithsonian not in ('nan', 'null', ''):
-            patterns.extend([
-                smithsonian,           # Direct match
-                f"{smithsonian}_",     # With underscore prefix
-            ])
+        if smithsonian and smithsonian not in MISSING_SMITHSONIAN:
+            patterns.append(smithsonian)  # Direct match
+            if '_' in smithsonian:
+                patterns.append(f"{smithsonian}_")  # With underscore prefix
         
         # Try building ID patterns
         patterns.append(building_id)
         
         # Additional patterns for 5DV format
-        if building_id.startswith('5DV.'):
-            patterns.extend([
-                f"{building_id}_",
-            ])
+        if building_id.startswith('5DV.') and '_' in building_id:
+            patterns.append(f"{building_id}_")
         
         return patterns
     
@@ -133,12 +366,26 @@ class ImageIndex:
                 continue
             
             # Prefix matching
-            matches = [
-                img for key in self._index
-                if key.startswith(pattern)
-                for img in self._index[key]
-            ]
-            found_images.extend(matches)
+            found_images.extend(self._prefix_matches(pattern))
         
         # Remove duplicates while preserving order
         return list(dict.fromkeys(found_images))
+    
+    def _prefix_matches(self, pattern: str) -> List[str]:
+        """
+        Return all images whose index key starts with the pattern.
+        
+        Matches are grouped by key in sorted key order. Results are memoized
+        per pattern until clear_lookup_cache(); callers must not modify the list.
+        """
+        matches = self._prefix_cache.get(pattern)
+        if matches is None:
+            # Keys sharing a prefix are contiguous in sorted order
+            matches = []
+            keys = self._sorted_keys
+            for i in range(bisect_left(keys, pattern), len(keys)):
+                if not keys[i].startswith(pattern):
+                    break
+                matches.extend(self._index[keys[i]])
+            self._prefix_cache[pattern] = matches
+        return matches
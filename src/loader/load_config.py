@@ -6,12 +6,21 @@ to their CSV and image locations.
 """
 
 import json
+import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 from dataclasses import dataclass
 from loguru import logger
 
 
+def _path_exists(path: Path, listings: Optional[Dict[Path, Set[str]]]) -> bool:
+    """Check a path against directory listings, confirming misses with a stat."""
+    # A miss may still exist (e.g. different case on a case-insensitive filesystem)
+    if listings is not None and path.name in listings.get(path.parent, ()):
+        return True
+    return path.exists()
+
+
 @dataclass
 class DatasetConfig:
     """Configuration for a single dataset."""
@@ -30,15 +39,23 @@ class DatasetConfig:
         """Get style from metadata."""
         return self.metadata.get('style') if self.metadata else None
     
-    def validate(self, base_path: Path) -> bool:
-        """Validate that configured paths exist."""
+    def validate(self, base_path: Path,
+                 listings: Optional[Dict[Path, Set[str]]] = None) -> bool:
+        """
+        Validate that configured paths exist.
+        
+        Args:
+            base_path: Directory the configured paths are relative to
+            listings: Optional pre-read directory listings ({directory: entry names})
+                to check paths against instead of stat'ing each one
+        """
         csv_path = base_path / self.csv_file
         img_path = base_path / self.images_dir
         
-        if not csv_path.exists():
+        if not _path_exists(csv_path, listings):
             logger.error(f"CSV file not found: {csv_path}")
             return False
-        if not img_path.exists():
+        if not _path_exists(img_path, listings):
             logger.error(f"Images directory not found: {img_path}")
             return False
         
@@ -54,6 +71,7 @@ class DataStructureConfig:
     base_path: str
     datasets: List[DatasetConfig]
     notes: Optional[List[str]] = None
+    columns: Optional[Dict[str, Optional[str]]] = None  # column -> pandas dtype (None to infer)
     
     @classmethod
     def from_json(cls, json_path: str) -> 'DataStructureConfig':
@@ -77,9 +95,30 @@ class DataStructureConfig:
             structure_type=data.get('structure_type', 'unknown'),
             base_path=data.get('base_path', '.'),
             datasets=datasets,
-            notes=data.get('notes')
+            notes=data.get('notes'),
+            columns=data.get('columns')
         )
     
+    def validate_datasets(self, base_path: Path) -> List[str]:
+        """
+        Validate every dataset, listing each directory that holds a configured path once.
+        
+        Args:
+            base_path: Directory the configured paths are relative to
+            
+        Returns:
+            Names of datasets whose CSV file or images directory is missing
+        """
+        paths = [base_path / p for ds in self.datasets for p in (ds.csv_file, ds.images_dir)]
+        listings = {}
+        for parent in {path.parent for path in paths}:
+            try:
+                listings[parent] = set(os.listdir(parent))
+            except OSError:
+                listings[parent] = set()
+        
+        return [ds.name for ds in self.datasets if not ds.validate(base_path, listings)]
+    
     def get_dataset(self, name: str) -> Optional[DatasetConfig]:
         """Get dataset configuration by name."""
         for ds in self.datasets:
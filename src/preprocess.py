@@ -1,45 +1,632 @@
+import asyncio
+import os
+import shutil
+import struct
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 import numpy as np
-from PIL import Image
+import PIL
+from PIL import Image, ImageFile, UnidentifiedImageError, features
 import pandas as pd
 from loguru import logger
-import base64
 from io import BytesIO
 
-def prepare_images_for_openai(image_paths, max_size=(1024, 1024)):
+try:
+    import pybase64 as _b64
+except ImportError:  # pybase64 is an optional SIMD drop-in for the stdlib codec
+    import base64 as _b64
+
+try:
+    import narwhals as nw
+except ImportError:  # narwhals is optional; lets Polars and PyArrow tables skip pandas
+    nw = None
+
+try:
+    import pyvips
+except (ImportError, OSError):  # pyvips is optional; OSError when libvips itself is missing
+    pyvips = None
+
+
+# Pixel limit for decoding; full-resolution survey photos can exceed Pillow's
+# default decompression-bomb threshold, but a bound is still kept
+MAX_IMAGE_PIXELS = 250_000_000
+
+# Decode what is there of truncated files (e.g. interrupted survey uploads)
+# instead of failing the image
+LOAD_TRUNCATED_IMAGES = True
+
+# Formats accepted by the OpenAI Vision API; other files are skipped up front
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.webp', '.gif'})
+
+# MIME types for data URLs, by extension
+IMAGE_MIME_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.webp': 'image/webp',
+    '.gif': 'image/gif',
+}
+
+# JPEG quality for resized images, shared by every resize backend (Pillow's default)
+JPEG_QUALITY = 75
+
+# Encoder options for resized images, by Pillow format; smaller files mean less
+# base64 to build and fewer bytes to upload
+SAVE_OPTIONS = {
+    'JPEG': {'quality': JPEG_QUALITY, 'optimize': True, 'progressive': True, 'subsampling': '4:2:0'},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': JPEG_QUALITY},
+}
+
+# Errors that mark a single image as unusable rather than a bug
+IMAGE_ERRORS = (UnidentifiedImageError, OSError, Image.DecompressionBombError)
+
+# Failed paths listed in the summary error message
+MAX_LOGGED_FAILURES = 10
+
+# JPEGs decoded and resized together by prepare_images_gpu; bounds GPU memory
+GPU_BATCH_SIZE = 64
+
+# Paths handed to each worker per task; keeps IPC overhead low on large batches
+RESIZE_CHUNKSIZE = 32
+
+# JPEG start-of-frame markers, which carry the image dimensions (C4, C8 and CC
+# share the range but are not frames)
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Images read and encoded at once by encode_images_async
+ENCODE_CONCURRENCY = 5
+
+# Bytes read per base64 chunk; a multiple of 3 so encoded chunks concatenate
+# without padding
+BASE64_CHUNK_SIZE = 3 * 64 * 1024
+
+
+def _log_pillow_build():
+    """Log whether the installed Pillow has the SIMD resampling kernels."""
+    # Pillow-SIMD releases carry a ".postN" suffix on the upstream version
+    simd = '.post' in PIL.__version__
+    logger.debug(
+        "Pillow {} ({} build, libjpeg-turbo: {})",
+        PIL.__version__, 'SIMD' if simd else 'stock', features.check_feature('libjpeg_turbo'),
+    )
+
+def _init_worker(max_image_pixels=MAX_IMAGE_PIXELS):
+    """Apply Pillow settings and warm up the JPEG codec once per worker process."""
+    Image.MAX_IMAGE_PIXELS = max_image_pixels
+    ImageFile.LOAD_TRUNCATED_IMAGES = LOAD_TRUNCATED_IMAGES
+    
+    # Round-trip a 1x1 JPEG so the codec is loaded before the first real image
+    buf = BytesIO()
+    Image.new('RGB', (1, 1)).save(buf, format='JPEG')
+    buf.seek(0)
+    with Image.open(buf) as stub:
+        stub.load()
+
+@contextmanager
+def _pillow_settings(max_image_pixels=MAX_IMAGE_PIXELS):
+    """
+    Apply the worker Pillow settings in the calling process for the duration
+    of a batch, restoring the caller's own settings afterwards.
+    """
+    saved = Image.MAX_IMAGE_PIXELS, ImageFile.LOAD_TRUNCATED_IMAGES
+    _init_worker(max_image_pixels)
+    try:
+        yield
+    finally:
+        Image.MAX_IMAGE_PIXELS, ImageFile.LOAD_TRUNCATED_IMAGES = saved
+
+def _read_jpeg_size(f):
+    """
+    Read JPEG dimensions by walking the segment markers up to the first frame header.
+    
+    Args:
+        f: Binary file positioned just after the SOI marker
+        
+    Returns:
+        (width, height), or None if no frame header is found
+    """
+    while True:
+        byte = f.read(1)
+        # Skip fill bytes between segments
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        # Standalone markers have no length field
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            continue
+        header = f.read(2)
+        if len(header) < 2:
+            return None
+        (length,) = struct.unpack('>H', header)
+        if marker in JPEG_SOF_MARKERS:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            _, height, width = struct.unpack('>BHH', frame)
+            return width, height
+        if marker == 0xD9 or length < 2:
+            return None
+        f.seek(length - 2, os.SEEK_CUR)
+
+def _read_image_size(img_path):
+    """
+    Read image dimensions from the file header without constructing a PIL image.
+    
+    Handles JPEG and PNG; other formats are left to PIL.
+    
+    Args:
+        img_path: Path to the image file
+        
+    Returns:
+        (width, height), or None if the format is not recognized
+    """
+    with open(img_path, 'rb') as f:
+        head = f.read(24)
+        if head[:2] == b'\xff\xd8':
+            f.seek(2)
+            return _read_jpeg_size(f)
+        # PNG: signature, then the IHDR chunk with width and height at offset 16
+        if head[:8] == PNG_SIGNATURE and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+    return None
+
+def _resized_path(img_path, output_dir=None):
+    """Path the resized image is written to: in output_dir, or a sibling of the source."""
+    if output_dir:
+        path = os.path.join(output_dir, os.path.basename(img_path))
+        # Never overwrite the source itself
+        if os.path.abspath(path) != os.path.abspath(img_path):
+            return path
+    base_path = img_path.rsplit('.', 1)[0]
+    ext = img_path.rsplit('.', 1)[1] if '.' in img_path else 'jpg'
+    return f"{base_path}_resized.{ext}"
+
+def _prepared(img_path, return_bytes, output_dir=None):
+    """
+    Result for an image file used as-is.
+    
+    Args:
+        img_path: Path to the image file
+        return_bytes: Return its base64 bytes instead of a path
+        output_dir: Directory to hardlink (or copy) the file into
+        
+    Returns:
+        Path, output_dir path or base64 bytes; None on failure
+    """
+    if return_bytes:
+        buf = BytesIO()
+        if encode_image_to_base64_to(img_path, buf) is None:
+            return None
+        return buf.getvalue()
+    if output_dir:
+        return _link_into(img_path, _resized_path(img_path, output_dir))
+    return img_path
+
+def _link_into(img_path, target):
+    """
+    Hardlink an image to target, copying when a link isn't possible
+    (e.g. across filesystems).
+    
+    Returns:
+        target, or None on failure
+    """
+    try:
+        if os.path.lexists(target):
+            if os.path.samefile(img_path, target):
+                return target
+            os.unlink(target)
+        try:
+            os.link(img_path, target)
+        except OSError:
+            shutil.copy2(img_path, target)
+    except OSError as e:
+        logger.debug("Could not link {} into {}: {}", img_path, target, e)
+        return None
+    return target
+
+def _clear_target(path):
+    """Remove an existing output file; it may be a hardlink to a source image."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+def _resize_with_vips(img_path, max_size, return_bytes=False, output_dir=None):
+    """
+    Resize an image with libvips, which shrinks JPEGs while decoding and
+    streams the pixels instead of loading the full-resolution image.
+    
+    Args:
+        img_path: Path to the image file
+        max_size: Maximum size (width, height) for the image
+        return_bytes: Return base64 bytes instead of writing a resized file
+        output_dir: Directory for prepared files (None writes siblings)
+        
+    Returns:
+        Path of the prepared image (the original if no resize was needed),
+        or its base64 bytes if return_bytes is set
+    """
+    # Opening only reads the header
+    header = pyvips.Image.new_from_file(img_path, access='sequential')
+    if header.width <= max_size[0] and header.height <= max_size[1]:
+        return _prepared(img_path, return_bytes, output_dir)
+    
+    thumb = pyvips.Image.thumbnail(img_path, max_size[0], height=max_size[1], size='down')
+    resized_path = _resized_path(img_path, output_dir)
+    ext = resized_path.rsplit('.', 1)[1].lower()
+    if ext in ('jpg', 'jpeg'):
+        # libvips equivalents of the Pillow JPEG options
+        options = {'Q': JPEG_QUALITY, 'optimize_coding': True, 'interlace': True, 'strip': True}
+    else:
+        options = {'strip': True}
+    if return_bytes:
+        return _b64.b64encode(thumb.write_to_buffer(f'.{ext}', **options))
+    _clear_target(resized_path)
+    thumb.write_to_file(resized_path, **options)
+    _stamp_resized(img_path, resized_path)
+    return resized_path
+
+def _stamp_resized(img_path, resized_path):
+    """Give a resized image its source's modification time, marking what it was made from."""
+    source = os.stat(img_path)
+    os.utime(resized_path, ns=(source.st_atime_ns, source.st_mtime_ns))
+
+def _is_resize_current(img_path, resized_path, max_size, source_size):
+    """
+    Check whether a resized image from an earlier run can be reused.
+    
+    Args:
+        img_path: Path to the source image
+        resized_path: Path of its resized image
+        max_size: Maximum size (width, height) for the image
+        source_size: (width, height) of the source image, or None if not known
+        
+    Returns:
+        True if the resized image carries the source's modification time
+        (see _stamp_resized) and has the size max_size gives the source
+    """
+    try:
+        # Other sources, or this one since changed, have other mtimes
+        if os.stat(resized_path).st_mtime_ns != os.stat(img_path).st_mtime_ns:
+            return False
+        # Formats without a fast header reader (WebP, GIF) only open the header
+        if source_size is None:
+            with Image.open(img_path) as img:
+                source_size = img.size
+        size = _read_image_size(resized_path)
+        if size is None:
+            with Image.open(resized_path) as img:
+                size = img.size
+    except IMAGE_ERRORS:
+        return False
+    if size[0] > max_size[0] or size[1] > max_size[1]:
+        return False
+    # Resizing fills max_size along the limiting side, so an image made for a
+    # smaller max_size falls short on both
+    return (size[0] == min(max_size[0], source_size[0])
+            or size[1] == min(max_size[1], source_size[1]))
+
+def _resize_one(img_path, output_dir, max_size, return_bytes=False):
+    """
+    Resize a single image to fit within max_size.
+    
+    Runs in a worker process, so it must stay a top-level function. Resized
+    images left by earlier runs are reused if they were made from this
+    version of the source for the same max_size. Uses
+    libvips when pyvips is installed and falls back to Pillow if it fails.
+    
+    Args:
+        img_path: Path to the image file
+        output_dir: Directory for the prepared file (None writes a sibling)
+        max_size: Maximum size (width, height) for the image
+        return_bytes: Return base64 bytes instead of writing a resized file
+        
+    Returns:
+        Path of the prepared image (the original if no resize was needed),
+        or its base64 bytes if return_bytes is set; None if the image could
+        not be processed
+    """
+    # Images that already fit are identified from their headers alone
+    try:
+        size = _read_image_size(img_path)
+    except OSError:
+        size = None
+    if size is not None and size[0] <= max_size[0] and size[1] <= max_size[1]:
+        return _prepared(img_path, return_bytes, output_dir)
+    
+    resized_path = _resized_path(img_path, output_dir)
+    if _is_resize_current(img_path, resized_path, max_size, size):
+        return _prepared(resized_path, return_bytes)
+    
+    if pyvips is not None:
+        try:
+            return _resize_with_vips(img_path, max_size, return_bytes, output_dir)
+        except pyvips.Error as e:
+            logger.debug("libvips could not resize {}, using Pillow: {}", img_path, e)
+        except IMAGE_ERRORS as e:
+            # Writing the target failed (e.g. unwritable); Pillow would fail the same way
+            logger.debug("Error processing image {}: {}", img_path, e)
+            return None
+    
+    try:
+        with Image.open(img_path) as img:
+            # Check if image needs resizing
+            if img.size[0] > max_size[0] or img.size[1] > max_size[1]:
+                if img.format == 'JPEG':
+                    # Let libjpeg decode at the smallest 1/2, 1/4 or 1/8 scale that
+                    # still covers max_size; Lanczos then does the final step
+                    img.draft(img.mode, max_size)
+                img.thumbnail(max_size, Image.Resampling.LANCZOS)
+                if return_bytes:
+                    buf = BytesIO()
+                    fmt = img.format or 'JPEG'
+                    img.save(buf, format=fmt, **SAVE_OPTIONS.get(fmt, {}))
+                    return _b64.b64encode(buf.getvalue())
+                # Save resized image with modified name, in the format its extension names
+                fmt = Image.registered_extensions().get(os.path.splitext(resized_path)[1].lower())
+                _clear_target(resized_path)
+                img.save(resized_path, format=fmt, **SAVE_OPTIONS.get(fmt, {}))
+                _stamp_resized(img_path, resized_path)
+                return resized_path
+        return _prepared(img_path, return_bytes, output_dir)
+    except IMAGE_ERRORS as e:
+        # Failures are summarized by prepare_images_for_openai
+        logger.debug("Error processing image {}: {}", img_path, e)
+        return None
+
+def prepare_images_for_openai(image_paths, max_size=(1024, 1024), max_workers=None,
+                              return_bytes=False, pool='thread', output_dir=None):
     """
     Prepare images for OpenAI Vision API by ensuring they meet size requirements.
     
+    Images are resized in parallel threads, or worker processes with
+    pool='process'; the returned paths keep the order of image_paths. Paths
+    that are not files or don't have a supported extension
+    (IMAGE_EXTENSIONS) are skipped before any image is opened.
+    
     Args:
         image_paths: List of image file paths
         max_size: Maximum size (width, height) for images
+        max_workers: Number of workers (defaults to the CPU count for
+            processes and twice that for threads; 1 processes images in the
+            calling thread)
+        return_bytes: Return each image as base64-encoded bytes instead of a
+            path; resized images are encoded from memory and never written
+        pool: 'thread' or 'process'. Decoding, resizing and file I/O release
+            the GIL, so threads avoid process startup and result pickling.
+            Processes are started with spawn on Windows and macOS, where
+            the calling script must guard its entry point with
+            ``if __name__ == '__main__':``
+        output_dir: Directory to collect prepared images in, laid out as
+            the sources are below their common parent directory so images
+            with the same file name don't collide: resized images are
+            written there and images that already fit are hardlinked
+            (copied across filesystems). Ignored with return_bytes
         
     Returns:
-        List of image paths (resized if necessary) ready for OpenAI API
+        List of image paths (resized if necessary, in output_dir if given)
+        ready for OpenAI API, or of base64 bytes if return_bytes is set
     """
+    if pool not in ('process', 'thread'):
+        raise ValueError(f"pool must be 'process' or 'thread', got {pool!r}")
+    
     logger.info(f"Preparing {len(image_paths)} images for OpenAI Vision API")
+    _log_pillow_build()
+    image_paths = _validate_image_paths(image_paths)
+    if not max_workers:
+        max_workers = (os.cpu_count() or 1) * (2 if pool == 'thread' else 1)
+    if output_dir and not return_bytes:
+        output_dirs = _output_dirs(image_paths, output_dir)
+    else:
+        output_dirs = [None] * len(image_paths)
+    resize = partial(_resize_one, max_size=max_size, return_bytes=return_bytes)
     prepared_paths = []
     
-    for i, img_path in enumerate(image_paths):
+    if max_workers == 1 or len(image_paths) <= 1:
+        with _pillow_settings():
+            results = map(resize, image_paths, output_dirs)
+            failures = _collect_prepared(image_paths, results, prepared_paths)
+    elif pool == 'thread':
+        # Threads share the calling process's Pillow settings, so they are
+        # only changed while the batch runs
+        with _pillow_settings(), ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(resize, image_paths, output_dirs)
+            failures = _collect_prepared(image_paths, results, prepared_paths)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+            # Smaller chunks for short batches so every worker gets a share
+            chunksize = max(1, min(RESIZE_CHUNKSIZE, len(image_paths) // max_workers))
+            results = executor.map(resize, image_paths, output_dirs, chunksize=chunksize)
+            failures = _collect_prepared(image_paths, results, prepared_paths)
+    
+    _log_failures(failures)
+    logger.info(f"Successfully prepared {len(prepared_paths)} images for OpenAI Vision API")
+    return prepared_paths
+
+def _validate_image_paths(image_paths):
+    """
+    Keep the paths that are files with a supported image extension.
+    
+    Args:
+        image_paths: List of image file paths
+        
+    Returns:
+        List of valid paths, in their original order
+    """
+    valid_paths = [
+        path for path in image_paths
+        if os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS and os.path.isfile(path)
+    ]
+    skipped = len(image_paths) - len(valid_paths)
+    if skipped:
+        logger.warning(f"Skipping {skipped} paths that are not supported image files")
+    return valid_paths
+
+def _output_dirs(image_paths, output_dir):
+    """
+    Directory in output_dir for each image, mirroring where the images sit
+    below their common parent directory.
+    
+    Args:
+        image_paths: List of image file paths
+        output_dir: Directory to collect prepared images in
+        
+    Returns:
+        List of directories (created if missing), in the order of image_paths
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if not image_paths:
+        return []
+    parents = [os.path.dirname(os.path.abspath(path)) for path in image_paths]
+    root = os.path.commonpath(parents)
+    output_dirs = [os.path.normpath(os.path.join(output_dir, os.path.relpath(parent, root)))
+                   for parent in parents]
+    for path in set(output_dirs):
+        os.makedirs(path, exist_ok=True)
+    return output_dirs
+
+def _collect_prepared(image_paths, results, prepared_paths):
+    """
+    Gather prepared images in order, logging progress.
+    
+    Args:
+        image_paths: Paths the results were computed for, in the same order
+        results: Iterable of prepared paths or None for failures
+        prepared_paths: List the successful results are appended to
+        
+    Returns:
+        List of paths that failed
+    """
+    failures = []
+    for i, (img_path, prepared_path) in enumerate(zip(image_paths, results)):
         if i % 100 == 0:  # Log progress every 100 images
-            logger.debug(f"Processing image {i+1}/{len(image_paths)}")
+            logger.debug("Processed image {}/{}", i + 1, len(image_paths))
+        if prepared_path is None:
+            failures.append(img_path)
+        else:
+            prepared_paths.append(prepared_path)
+    return failures
+
+def _log_failures(failures):
+    """Report images that could not be prepared in a single error message."""
+    if failures:
+        logger.error(
+            f"Could not process {len(failures)} images: "
+            f"{', '.join(failures[:MAX_LOGGED_FAILURES])}"
+            f"{' ...' if len(failures) > MAX_LOGGED_FAILURES else ''}"
+        )
+
+def _fit_size(width, height, max_size):
+    """Largest (width, height) with the same aspect ratio that fits max_size."""
+    scale = min(max_size[0] / width, max_size[1] / height)
+    return (max(1, min(max_size[0], round(width * scale))),
+            max(1, min(max_size[1], round(height * scale))))
+
+def _resize_jpeg_batch_gpu(img_paths, max_size, device):
+    """
+    Decode, resize and re-encode a batch of JPEGs on the GPU.
+    
+    Args:
+        img_paths: Paths of JPEG files that need resizing
+        max_size: Maximum size (width, height) for images
+        device: Torch device to run on
         
+    Returns:
+        List of resized paths (None for failures), in the order of img_paths
+    """
+    import torchvision
+    from torchvision.io import ImageReadMode
+    from torchvision.transforms.v2 import functional as TF
+    
+    try:
+        data = [torchvision.io.read_file(path) for path in img_paths]
+        images = torchvision.io.decode_jpeg(data, mode=ImageReadMode.RGB, device=device)
+    except RuntimeError as e:
+        # One undecodable file fails the whole batch; redo it on the CPU
+        logger.debug("GPU decode failed, resizing batch on the CPU: {}", e)
+        return [_resize_one(path, None, max_size) for path in img_paths]
+    
+    resized_paths = []
+    for img_path, image in zip(img_paths, images):
+        height, width = image.shape[-2:]
+        new_width, new_height = _fit_size(width, height, max_size)
+        resized = TF.resize(image, [new_height, new_width], antialias=True)
+        encoded = torchvision.io.encode_jpeg(resized, quality=JPEG_QUALITY)
+        resized_path = _resized_path(img_path)
         try:
-            with Image.open(img_path) as img:
-                # Check if image needs resizing
-                if img.size[0] > max_size[0] or img.size[1] > max_size[1]:
-                    img.thumbnail(max_size, Image.Resampling.LANCZOS)
-                    # Save resized image with modified name
-                    base_path = img_path.rsplit('.', 1)[0]
-                    ext = img_path.rsplit('.', 1)[1] if '.' in img_path else 'jpg'
-                    resized_path = f"{base_path}_resized.{ext}"
-                    img.save(resized_path)
-                    prepared_paths.append(resized_path)
-                else:
-                    prepared_paths.append(img_path)
-        except Exception as e:
-            logger.error(f"Error processing image {img_path}: {e}")
-            continue
+            torchvision.io.write_file(resized_path, encoded.cpu())
+            _stamp_resized(img_path, resized_path)
+        except OSError as e:
+            # Failures are summarized by prepare_images_gpu
+            logger.debug("Error processing image {}: {}", img_path, e)
+            resized_path = None
+        resized_paths.append(resized_path)
+    return resized_paths
+
+def prepare_images_gpu(image_paths, max_size=(1024, 1024), device='cuda'):
+    """
+    Prepare images for OpenAI Vision API, resizing JPEGs on the GPU.
+    
+    JPEGs that need resizing are decoded with nvJPEG, resized with antialiasing
+    and re-encoded in batches of GPU_BATCH_SIZE. Other formats go through the
+    CPU path. Falls back to prepare_images_for_openai when torch/torchvision
+    aren't installed or CUDA isn't available.
+    
+    Args:
+        image_paths: List of image file paths
+        max_size: Maximum size (width, height) for images
+        device: Torch device to run on
+        
+    Returns:
+        List of image paths (resized if necessary) ready for OpenAI API
+    """
+    try:
+        # Imported on first use; loading torch takes seconds and most callers
+        # never reach the GPU path
+        import torch
+        import torchvision  # noqa: F401 (used by _resize_jpeg_batch_gpu)
+        cuda_available = torch.cuda.is_available()
+    except ImportError:  # torch/torchvision are optional
+        cuda_available = False
+    if not cuda_available:
+        logger.info("CUDA is not available, preparing images on the CPU")
+        return prepare_images_for_openai(image_paths, max_size)
     
+    logger.info(f"Preparing {len(image_paths)} images for OpenAI Vision API on {device}")
+    image_paths = _validate_image_paths(image_paths)
+    results = [None] * len(image_paths)
+    
+    # Same shortcuts as _resize_one; only JPEGs that need resizing reach the GPU
+    pending = []
+    for i, img_path in enumerate(image_paths):
+        try:
+            size = _read_image_size(img_path)
+        except OSError:
+            size = None
+        resized_path = _resized_path(img_path)
+        if size is not None and size[0] <= max_size[0] and size[1] <= max_size[1]:
+            results[i] = img_path
+        elif _is_resize_current(img_path, resized_path, max_size, size):
+            results[i] = resized_path
+        elif size is not None and img_path.lower().endswith(('.jpg', '.jpeg')):
+            pending.append(i)
+        else:
+            results[i] = _resize_one(img_path, None, max_size)
+    
+    for start in range(0, len(pending), GPU_BATCH_SIZE):
+        batch = pending[start:start + GPU_BATCH_SIZE]
+        resized_paths = _resize_jpeg_batch_gpu([image_paths[i] for i in batch], max_size, device)
+        for i, resized_path in zip(batch, resized_paths):
+            results[i] = resized_path
+    
+    _log_failures([path for path, result in zip(image_paths, results) if result is None])
+    prepared_paths = [result for result in results if result is not None]
     logger.info(f"Successfully prepared {len(prepared_paths)} images for OpenAI Vision API")
     return prepared_paths
 
@@ -53,34 +640,249 @@ def encode_image_to_base64(image_path):
     Returns:
         Base64 encoded string of the image
     """
+    buf = BytesIO()
+    if encode_image_to_base64_to(image_path, buf) is None:
+        return None
+    return buf.getvalue().decode('ascii')
+
+def encode_image_to_base64_to(image_path, stream):
+    """
+    Stream an image file as base64 into a binary stream.
+    
+    The file is encoded in chunks, so only one chunk of the image is held
+    in memory; write straight into a request body or file to skip building
+    the encoded string at all.
+    
+    Args:
+        image_path: Path to the image file
+        stream: Writable binary stream receiving the base64 bytes
+        
+    Returns:
+        Number of base64 bytes written, or None on failure
+    """
+    written = 0
     try:
         with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode('utf-8')
+            while chunk := image_file.read(BASE64_CHUNK_SIZE):
+                written += stream.write(_b64.b64encode(chunk))
     except Exception as e:
         logger.error(f"Error encoding image {image_path} to base64: {e}")
         return None
+    return written
+
+def build_openai_image_message(image_path):
+    """
+    Build the JSON image content part for an OpenAI chat message.
+    
+    The fixed envelope is written around the base64 data in a single buffer,
+    so the encoded image is never decoded to str or copied into an f-string:
+    {"type": "image_url", "image_url": {"url": "data:<mime>;base64,<data>"}}
+    
+    Args:
+        image_path: Path to the image file
+        
+    Returns:
+        UTF-8 JSON bytes of the content part, or None on failure
+    """
+    mime = IMAGE_MIME_TYPES.get(os.path.splitext(image_path)[1].lower(), 'image/jpeg')
+    buf = BytesIO()
+    buf.write(f'{{"type": "image_url", "image_url": {{"url": "data:{mime};base64,'.encode('ascii'))
+    if encode_image_to_base64_to(image_path, buf) is None:
+        return None
+    buf.write(b'"}}')
+    return buf.getvalue()
+
+async def encode_image_to_base64_async(image_path, semaphore):
+    """
+    Encode an image file to base64 without blocking the event loop.
+    
+    The file read and encoding run on the default executor; both release
+    the GIL, so several images are encoded in parallel while other
+    coroutines (e.g. API requests) make progress.
+    
+    Args:
+        image_path: Path to the image file
+        semaphore: asyncio.Semaphore bounding concurrent encodes
+        
+    Returns:
+        Base64 encoded string of the image, or None on failure
+    """
+    async with semaphore:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, encode_image_to_base64, image_path)
+
+async def encode_images_async(image_paths, concurrency=ENCODE_CONCURRENCY):
+    """
+    Encode a batch of images to base64 concurrently.
+    
+    Args:
+        image_paths: List of image file paths
+        concurrency: Maximum number of images encoded at once
+        
+    Returns:
+        List of base64 strings (None for images that failed), in the order
+        of image_paths
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(
+        *(encode_image_to_base64_async(path, semaphore) for path in image_paths)
+    )
 
-def preprocess_attributes(df):
+def preprocess_attributes(df, downcast=False):
     """
     Preprocess attribute DataFrame for training.
     
+    pandas DataFrames are processed with pandas. When narwhals is installed,
+    other eager frames (Polars, PyArrow) are processed natively and returned
+    in their own type; their non-numeric columns keep missing values, since
+    a typed string column can't hold 0.
+    
     Args:
-        df: pandas DataFrame with building attributes
+        df: pandas DataFrame with building attributes (or a Polars/PyArrow
+            frame when narwhals is installed)
+        downcast: Shrink numeric pandas columns after filling: integral
+            columns to the smallest integer dtype, float columns to float32
+            where every value survives the conversion exactly. Off by
+            default, since it changes the column dtypes callers get back
         
     Returns:
-        Processed DataFrame
+        Processed DataFrame of the same type as df
     """
-    logger.info(f"Preprocessing attributes DataFrame with {len(df)} rows and {len(df.columns)} columns")
+    frame = None
+    if nw is not None and not isinstance(df, pd.DataFrame):
+        frame = nw.from_native(df, eager_only=True)
+    n_rows, n_cols = frame.shape if frame is not None else df.shape
+    logger.info(f"Preprocessing attributes DataFrame with {n_rows} rows and {n_cols} columns")
     
     # Log missing values
-    missing_counts = df.isnull().sum()
+    if frame is not None:
+        missing_counts = pd.Series(frame.null_count().row(0), index=frame.columns)
+    else:
+        # Counting and filling share one missing-value mask per column
+        result, missing_counts = _fill_missing(df)
     total_missing = missing_counts.sum()
     if total_missing > 0:
         logger.warning(f"Found {total_missing} missing values across {(missing_counts > 0).sum()} columns")
-        for col, count in missing_counts[missing_counts > 0].items():
-            logger.debug(f"Column '{col}': {count} missing values")
+        # Only built when DEBUG messages are actually emitted
+        logger.opt(lazy=True).debug(
+            "Missing values per column: {}",
+            lambda: missing_counts[missing_counts > 0].to_dict(),
+        )
     
     # Placeholder: implement attribute normalization/encoding as needed
-    result = df.fillna(0)
-    logger.info(f"Successfully preprocessed attributes, filled {total_missing} missing values with 0")
+    if frame is not None:
+        result, total_filled = _fill_missing_native(frame, missing_counts)
+    else:
+        total_filled = total_missing
+        if downcast:
+            result = _downcast_numeric(result)
+    logger.info(f"Successfully preprocessed attributes, filled {total_filled} missing values with 0")
     return result
+
+def _fill_missing_native(frame, missing_counts):
+    """
+    Fill missing numeric values with 0 in a narwhals-wrapped frame.
+    
+    Unlike _fill_missing, which fills every column, only numeric columns are
+    filled: the typed string, boolean and temporal columns of Polars and
+    PyArrow can't hold 0, so they keep their missing values.
+    
+    Args:
+        frame: narwhals DataFrame with building attributes
+        missing_counts: Per-column missing value counts (pandas Series)
+        
+    Returns:
+        Tuple of (native frame with missing values filled, number of values filled)
+    """
+    schema = frame.schema
+    columns = [col for col, count in missing_counts.items() if count and schema[col].is_numeric()]
+    if not columns:
+        return frame.to_native(), 0
+    result = frame.with_columns(nw.col(*columns).fill_null(0))
+    return result.to_native(), int(missing_counts[columns].sum())
+
+def _fill_missing(df):
+    """
+    Count missing values and fill them with 0 in a single pass per column.
+    
+    Each column's missing-value mask is computed once and used for both the
+    count and the fill; Arrow-backed columns (ArrowDtype and pyarrow
+    strings) read their stored null count instead. NumPy float columns are
+    filled with a masked np.copyto; other dtypes use the column's fillna so
+    their conversion rules match DataFrame.fillna. Columns without missing
+    values are shared with df rather than copied.
+    
+    Args:
+        df: pandas DataFrame with building attributes
+        
+    Returns:
+        Tuple of (DataFrame with missing values replaced by 0,
+        per-column missing value counts as a Series)
+    """
+    result = df.copy(deep=False)
+    counts = np.zeros(df.shape[1], dtype=np.int64)
+    for i in range(df.shape[1]):
+        column = df.iloc[:, i]
+        if isinstance(column.dtype, np.dtype) and column.dtype.kind == 'f':
+            values = column.to_numpy()
+            mask = np.isnan(values)
+            counts[i] = np.count_nonzero(mask)
+            if counts[i]:
+                values = values.copy()
+                np.copyto(values, 0, where=mask)
+                result.isetitem(i, values)
+        else:
+            if _is_arrow_backed(column.dtype):
+                # Arrow arrays keep their null count as metadata; no scan needed
+                counts[i] = column.array.__arrow_array__().null_count
+            else:
+                counts[i] = np.count_nonzero(column.isna().to_numpy())
+            if counts[i]:
+                result.isetitem(i, column.fillna(0))
+    return result, pd.Series(counts, index=df.columns)
+
+def _is_arrow_backed(dtype):
+    """Whether a column dtype stores its data in a pyarrow ChunkedArray."""
+    if isinstance(dtype, pd.ArrowDtype):
+        return True
+    return isinstance(dtype, pd.StringDtype) and dtype.storage == 'pyarrow'
+
+def _downcast_numeric(df):
+    """
+    Downcast numeric columns to the smallest dtype that holds their values.
+    
+    Float columns holding only whole numbers below 2**53 become integers;
+    other float columns become float32 only if no value changes (0.1, for
+    one, does not survive). bool columns are left alone.
+    
+    Args:
+        df: pandas DataFrame without missing numeric values; modified in place
+        
+    Returns:
+        df
+    """
+    bytes_before = bytes_after = 0
+    for i in range(df.shape[1]):
+        column = df.iloc[:, i]
+        kind = getattr(column.dtype, 'kind', None)
+        if kind not in ('i', 'u', 'f'):
+            continue
+        if kind == 'f':
+            values = column.to_numpy(dtype=np.float64)
+            # Beyond 2**53 floats aren't exact integers (and may not fit int64)
+            if (np.abs(values) < 2 ** 53).all() and (values % 1 == 0).all():
+                downcast = pd.to_numeric(column, downcast='integer')
+            else:
+                # Values beyond float32's range overflow to inf and fail the check
+                with np.errstate(over='ignore'):
+                    exact = np.array_equal(values, values.astype(np.float32))
+                if not exact:
+                    continue
+                downcast = column.astype(np.float32)
+        else:
+            downcast = pd.to_numeric(column, downcast='unsigned' if kind == 'u' else 'integer')
+        bytes_before += column.memory_usage(index=False)
+        bytes_after += downcast.memory_usage(index=False)
+        df.isetitem(i, downcast)
+    logger.debug("Downcast numeric columns from {} to {} bytes", bytes_before, bytes_after)
+    return df
@@ -0,0 +1,29 @@
+"""
+Tests for bulk image matching.
+"""
+
+from arepas.loader.image_index import ImageIndex
+
+
+def test_bulk_lookup_matches_find_images_in_order(tmp_path):
+    # Several images per key, suffixed variants found by prefix, and
+    # Smithsonian-numbered files matched ahead of the building ID
+    names = [
+        'B1.jpeg', 'B1.jpg', 'B1.png', 'B1_front.jpg', 'B1_2.PNG',
+        'B2.png', 'B2_1.jpg', 'B2_1.jpeg',
+        '5DV.100.jpg', '5DV.100_a.png', '5DV.100_b.jpg',
+        'B3_x.jpg',
+    ]
+    for name in names:
+        (tmp_path / name).touch()
+    index = ImageIndex.build(str(tmp_path))
+    
+    building_ids = ['B1', 'B2', 'B3', 'B4', 'B1', '5DV.100']
+    smithsonians = ['', '5DV.100', 'None', '', 'B2', '']
+    
+    bulk = index.find_images_bulk(building_ids, smithsonians)
+    
+    expected = [index.find_images(building_id, smithsonian)
+                for building_id, smithsonian in zip(building_ids, smithsonians)]
+    assert [list(paths) for paths in bulk] == expected
+    assert any(len(paths) > 2 for paths in expected)
@@ -0,0 +1,51 @@
+"""
+Tests for collecting prepared images in an output directory.
+"""
+
+import os
+
+from PIL import Image, ImageFile
+
+from arepas.preprocess import prepare_images_for_openai
+
+
+def _write_image(path, size, color):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    Image.new('RGB', size, color).save(path, format='JPEG')
+    return str(path)
+
+
+def test_output_dir_keeps_images_with_the_same_name_apart(tmp_path):
+    large = _write_image(tmp_path / 'src' / 'a' / 'photo.jpg', (400, 200), 'red')
+    small = _write_image(tmp_path / 'src' / 'b' / 'photo.jpg', (50, 40), 'blue')
+    output_dir = tmp_path / 'out'
+    
+    prepared = prepare_images_for_openai([large, small], max_size=(100, 100),
+                                         max_workers=1, output_dir=str(output_dir))
+    
+    assert prepared == [str(output_dir / 'a' / 'photo.jpg'), str(output_dir / 'b' / 'photo.jpg')]
+    with Image.open(prepared[0]) as img:
+        assert img.size == (100, 50)
+    assert os.path.samefile(prepared[1], small)
+    # Sources are left untouched
+    with Image.open(large) as img:
+        assert img.size == (400, 200)
+
+
+def test_resized_image_for_a_smaller_max_size_is_not_reused(tmp_path):
+    source = _write_image(tmp_path / 'photo.jpg', (400, 200), 'red')
+    
+    prepare_images_for_openai([source], max_size=(100, 100), max_workers=1)
+    prepared = prepare_images_for_openai([source], max_size=(200, 200), max_workers=1)
+    
+    with Image.open(prepared[0]) as img:
+        assert img.size == (200, 100)
+
+
+def test_thread_pool_leaves_the_callers_pillow_settings_alone(tmp_path):
+    paths = [_write_image(tmp_path / f'{i}.jpg', (300, 200), 'red') for i in range(3)]
+    before = Image.MAX_IMAGE_PIXELS, ImageFile.LOAD_TRUNCATED_IMAGES
+    
+    prepare_images_for_openai(paths, max_size=(100, 100), max_workers=2, pool='thread')
+    
+    assert (Image.MAX_IMAGE_PIXELS, ImageFile.LOAD_TRUNCATED_IMAGES) == before